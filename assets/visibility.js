@@ -0,0 +1,14 @@
+/*
+ * Page visibility tracking for the Economic Network Dash application.
+ *
+ * This script mirrors the visibility state of the browser tab into the
+ * `page-visibility` store, so that a clientside callback can pause the
+ * simulation interval while the tab is hidden and resume it when the tab
+ * is shown again. Backgrounded tabs thus stop sending simulation requests.
+ */
+
+document.addEventListener('visibilitychange', function () {
+    if (window.dash_clientside && window.dash_clientside.set_props) {
+        window.dash_clientside.set_props('page-visibility', {data: document.visibilityState});
+    }
+});
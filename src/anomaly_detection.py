@@ -6,38 +6,190 @@ univariate time series data. It leverages a two-step process: first, it
 decomposes the time series to isolate seasonal, trend, and residual components.
 Then, it applies the Interquartile Range (IQR) method to the residuals to
 identify outliers, which are flagged as anomalies.
+
+The decomposition is a NumPy implementation of the classical moving-average
+decomposition, equivalent to `statsmodels.tsa.seasonal.seasonal_decompose`
+with `extrapolate_trend="freq"`, without its import and result-object overhead.
+
+For series that grow one observation at a time, the `StreamingDecomposer`
+class maintains an additive decomposition incrementally, so each new value
+costs O(period) instead of a full decomposition of the series.
 """
 
 # --- Imports ---
 # Standard library imports
 import math
-from typing import Sequence
+from bisect import bisect_left, insort
+from collections import deque
+from typing import Deque, List, Sequence, Tuple
 
 # Third-party library imports
 import numpy as np
-import pandas as pd
-from statsmodels.tsa.seasonal import seasonal_decompose
+from numpy.lib.stride_tricks import sliding_window_view
 
 # --- Helper Functions ---
-def _iqr(residuals: pd.Series, factor: float = 1.5) -> bool:
+def seasonal_period(n: int, seasonality: float = 0.05, max_period: int = 500) -> int:
+    """
+    Estimates the seasonal period of a series as a fraction of its length.
+
+    The period is capped so that the cost of the decomposition stays bounded for
+    long series. Larger periods can capture longer seasonal cycles, but the moving
+    average filter costs proportionally more.
+
+    Parameters:
+        n (int): The length of the time series.
+        seasonality (float): The ratio (0-1) of the series length used as the period.
+        max_period (int): The upper bound of the period.
+
+    Returns:
+        int: The seasonal period, between 2 and `max_period`.
+    """
+    return min(max_period, max(2, math.ceil(n * seasonality)))
+
+
+def _extrapolate_trend(trend: np.ndarray, front: int, back: int, npoints: int) -> np.ndarray:
+    """
+    Replaces the undefined end-points of a trend with least-squares linear extrapolations.
+
+    Each end is fitted on the `npoints` closest defined points, following the
+    conventions of `statsmodels`.
+
+    Parameters:
+        trend (np.ndarray): The trend, defined on the rows [front, back]. Modified in place.
+        front (int): The index of the first defined row.
+        back (int): The index of the last defined row.
+        npoints (int): The number of defined points used for each regression.
+
+    Returns:
+        np.ndarray: The extrapolated trend.
+    """
+    n = trend.shape[0]
+    front_last = min(front + npoints, back)
+    back_first = max(front, back - npoints)
+
+    # Fit and extrapolate the head of the trend
+    design = np.c_[np.arange(front, front_last), np.ones(front_last - front)]
+    k, c = np.linalg.lstsq(design, trend[front:front_last], rcond=-1)[0]
+    trend[:front] = np.multiply.outer(np.arange(0, front), k) + c
+
+    # Fit and extrapolate the tail of the trend
+    design = np.c_[np.arange(back_first, back), np.ones(back - back_first)]
+    k, c = np.linalg.lstsq(design, trend[back_first:back], rcond=-1)[0]
+    trend[back + 1:] = np.multiply.outer(np.arange(back + 1, n), k) + c
+
+    return trend
+
+
+def _decompose_residuals(values: np.ndarray, period: int, model: str = "additive") -> np.ndarray:
+    """
+    Computes the residuals of a classical seasonal decomposition.
+
+    The trend is a centered moving average over one period (with half weights at the
+    ends for even periods), linearly extrapolated at both ends. The seasonal component
+    is the mean of the detrended series at each phase of the period, normalized across
+    phases. Series are decomposed along the first axis, so a 2-D array is treated as
+    one independent series per column.
+
+    Parameters:
+        values (np.ndarray): A 1-D or 2-D float array.
+        period (int): The seasonal period.
+        model (str): The decomposition model, "additive" or "multiplicative".
+
+    Returns:
+        np.ndarray: The residuals, with the same shape as `values`.
+
+    Raises:
+        ValueError: If the series contains missing values, is shorter than two periods,
+                    or if a multiplicative model is requested for non-positive values.
+    """
+    multiplicative = model.startswith("m")
+    n = values.shape[0]
+    if not np.all(np.isfinite(values)):
+        raise ValueError("This function does not handle missing values")
+    if n < 2 * period:
+        raise ValueError(f"x must have 2 complete cycles requires {2 * period} observations. "
+                         f"x only has {n} observation(s)")
+    if multiplicative and np.any(values <= 0):
+        raise ValueError("Multiplicative seasonality is not appropriate for zero and negative values")
+
+    # Centered moving average filter
+    if period % 2 == 0:
+        filt = np.array([0.5] + [1.0] * (period - 1) + [0.5]) / period
+    else:
+        filt = np.full(period, 1.0 / period)
+    half = (len(filt) - 1) // 2
+
+    trend = np.empty_like(values)
+    trend[half:n - half] = sliding_window_view(values, len(filt), axis=0) @ filt
+    trend = _extrapolate_trend(trend, half, n - 1 - half, period)
+
+    detrended = values / trend if multiplicative else values - trend
+
+    # Per-phase means of the detrended series, padding the last cycle with NaN
+    cycles = -(-n // period)
+    padded = np.full((cycles * period,) + values.shape[1:], np.nan)
+    padded[:n] = detrended
+    period_averages = np.nanmean(padded.reshape((cycles, period) + values.shape[1:]), axis=0)
+    if multiplicative:
+        period_averages /= period_averages.mean(axis=0)
+    else:
+        period_averages -= period_averages.mean(axis=0)
+    seasonal = np.tile(period_averages, (cycles,) + (1,) * (values.ndim - 1))[:n]
+
+    # Remove the seasonal component in place, reusing the detrended buffer as the residuals
+    if multiplicative:
+        return np.divide(detrended, seasonal, out=detrended)
+    return np.subtract(detrended, seasonal, out=detrended)
+
+
+def _quartiles(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Computes the first and third quartiles along the first axis with a single partition.
+
+    The four order statistics around both quartiles are selected in one
+    `np.partition` call, in expected O(n), and linearly interpolated exactly as
+    `np.quantile` does.
+
+    Parameters:
+        values (np.ndarray): A 1-D or 2-D float array without missing values.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: The first and third quartiles.
+    """
+    n = values.shape[0]
+    positions = (0.25 * (n - 1), 0.75 * (n - 1))
+    lower = [math.floor(p) for p in positions]
+    upper = [min(i + 1, n - 1) for i in lower]
+    part = np.partition(values, sorted(set(lower + upper)), axis=0)
+
+    quartiles = []
+    for p, lo, hi in zip(positions, lower, upper):
+        a, b, t = part[lo], part[hi], p - lo
+        # Same interpolation formula as NumPy, for bit-identical results
+        quartiles.append(a + (b - a) * t if t < 0.5 else b - (b - a) * (1 - t))
+    return quartiles[0], quartiles[1]
+
+
+def _iqr(residuals: np.ndarray, factor: float = 1.5) -> bool:
     """
     Detects whether the latest value in a residual series is an outlier based on the IQR method.
 
-    This function calculates the quartiles (Q1, Q3), determines the IQR, and then defines
-    the lower and upper bounds for outliers. The last value of the `residuals` series
-    is then checked against these bounds.
+    This function calculates the quartiles (Q1, Q3) with a single partition, determines
+    the IQR, and then defines the lower and upper bounds for outliers. The last value of
+    the `residuals` series is then checked against these bounds.
 
     Parameters:
-        residuals (pd.Series): A time series of residuals from seasonal decomposition.
+        residuals (np.ndarray): A time series of residuals from seasonal decomposition.
         factor (float): The IQR multiplier used to define the outlier thresholds.
                         A common value is 1.5.
 
     Returns:
         bool: True if the latest residual is an outlier, False otherwise.
     """
-    # Calculate the first (Q1) and third (Q3) quartiles of the residual series
-    q1 = np.percentile(residuals, 25)
-    q3 = np.percentile(residuals, 75)
+    values = np.asarray(residuals, dtype=np.float64)
+
+    # Calculate the first (Q1) and third (Q3) quartiles of the residual series in a single pass
+    q1, q3 = _quartiles(values)
 
     # Calculate the Interquartile Range (IQR)
     iqr_range = q3 - q1
@@ -47,7 +199,7 @@ def _iqr(residuals: pd.Series, factor: float = 1.5) -> bool:
     upper_bound = q3 + factor * iqr_range
 
     # Check if the last residual falls outside the defined bounds
-    return bool(residuals.iloc[-1] < lower_bound or residuals.iloc[-1] > upper_bound)
+    return bool(values[-1] < lower_bound or values[-1] > upper_bound)
 
 
 # --- Main Functions ---
@@ -55,7 +207,8 @@ def detect_anomaly(
     timeseries: Sequence[float],
     model: str = "additive",
     seasonality: float = 0.05,
-    iqr_factor: float = 1.5
+    iqr_factor: float = 1.5,
+    max_period: int = 500,
 ) -> bool:
     """
     Detects anomalies in a univariate time series using seasonal decomposition and IQR.
@@ -72,24 +225,248 @@ def detect_anomaly(
                              For example, a value of 0.05 means the period is 5% of the series length.
         iqr_factor (float): The IQR multiplier for outlier detection. A higher value
                             makes the detection less sensitive.
+        max_period (int): The upper bound of the seasonal period, which bounds the
+                          decomposition cost regardless of the series length.
 
     Returns:
         bool: True if an anomaly is detected in the latest residual, False otherwise.
     """
     # Calculate the seasonal period based on the series length and seasonality factor
     n = len(timeseries)
-    period = max(2, math.ceil(n * seasonality))
+    period = seasonal_period(n, seasonality, max_period)
 
-    # Convert the sequence to a pandas Series for decomposition
-    series = pd.Series(timeseries, index=pd.RangeIndex(n))
+    # Convert the sequence to a contiguous array, which avoids any pandas overhead
+    values = np.ascontiguousarray(timeseries, dtype=np.float64)
 
-    # Perform seasonal decomposition
-    decomposition = seasonal_decompose(
-        series, model=model, period=period, extrapolate_trend="freq"
-    )
-
-    # Extract residuals and remove any NaN values that may result from decomposition
-    residuals = decomposition.resid.dropna()
+    # Perform seasonal decomposition. The extrapolated trend leaves no missing residuals.
+    residuals = _decompose_residuals(values, period, model)
 
     # Call the helper function to detect if the latest residual is an anomaly
     return _iqr(residuals, factor=iqr_factor)
+
+
+def detect_anomalies_batch(
+    matrix: np.ndarray,
+    model: str = "additive",
+    seasonality: float = 0.05,
+    iqr_factor: float = 1.5,
+    max_period: int = 500,
+) -> np.ndarray:
+    """
+    Detects anomalies in several time series of the same length at once.
+
+    Each column of `matrix` is treated as an independent series. All the columns
+    are decomposed in a single call, and the IQR check of their latest residuals
+    is vectorized across columns.
+
+    Parameters:
+        matrix (np.ndarray): A 2-D array of shape (n_observations, n_series).
+        model (str): The seasonal decomposition model to use. Options are "additive"
+                     (default) or "multiplicative".
+        seasonality (float): The ratio (0-1) used to estimate the seasonal period.
+        iqr_factor (float): The IQR multiplier for outlier detection.
+        max_period (int): The upper bound of the seasonal period.
+
+    Returns:
+        np.ndarray: A boolean array with one flag per series, True where an anomaly
+                    is detected in the latest residual.
+    """
+    values = np.asarray(matrix, dtype=np.float64)
+    period = seasonal_period(values.shape[0], seasonality, max_period)
+
+    # Decompose all the series at once
+    residuals = _decompose_residuals(values, period, model)
+
+    # Vectorized IQR check of the latest residual of each series
+    q1, q3 = _quartiles(residuals)
+    iqr_range = q3 - q1
+    last = residuals[-1]
+    return (last < q1 - iqr_factor * iqr_range) | (last > q3 + iqr_factor * iqr_range)
+
+
+# --- Streaming Detection ---
+class RunningQuartiles:
+    """
+    Maintains the exact first and third quartiles of a sliding window of values.
+
+    The window is kept both in arrival order, to know which value to evict, and
+    in sorted order, so each quartile is read by index instead of sorting the
+    window on every query. Quartiles are linearly interpolated between order
+    statistics, which matches `np.quantile` up to floating-point rounding.
+
+    Each push locates its insertion and eviction points by bisection, but
+    inserting into and deleting from the sorted list shifts its elements, so a
+    push costs O(n) in the window size. For the small detection windows used
+    here, that shift is a single fast memmove.
+
+    Attributes:
+        window (int): The maximum number of values kept.
+    """
+
+    def __init__(self, window: int):
+        """
+        Initializes an empty sliding window.
+
+        Parameters:
+            window (int): The maximum number of values kept, at least 1.
+        """
+        self.window = window
+        self._values: Deque[float] = deque()
+        self._sorted: List[float] = []
+
+    def __len__(self) -> int:
+        """
+        Returns the number of values currently in the window.
+        """
+        return len(self._values)
+
+    def push(self, value: float) -> None:
+        """
+        Adds a value to the window, evicting the oldest one if the window is full.
+
+        This costs O(n) in the window size, for shifting the sorted list.
+
+        Parameters:
+            value (float): The value to add.
+        """
+        if len(self._values) == self.window:
+            oldest = self._values.popleft()
+            del self._sorted[bisect_left(self._sorted, oldest)]
+        self._values.append(value)
+        insort(self._sorted, value)
+
+    def latest(self) -> float:
+        """
+        Returns the most recently added value.
+        """
+        return self._values[-1]
+
+    def quantile(self, q: float) -> float:
+        """
+        Returns a quantile of the window, linearly interpolated between order statistics.
+
+        Parameters:
+            q (float): The quantile to compute, in [0, 1].
+
+        Returns:
+            float: The requested quantile.
+        """
+        position = q * (len(self._sorted) - 1)
+        lower = math.floor(position)
+        upper = min(lower + 1, len(self._sorted) - 1)
+        fraction = position - lower
+        return self._sorted[lower] + (self._sorted[upper] - self._sorted[lower]) * fraction
+
+    def q1(self) -> float:
+        """
+        Returns the first quartile of the window.
+        """
+        return self.quantile(0.25)
+
+    def q3(self) -> float:
+        """
+        Returns the third quartile of the window.
+        """
+        return self.quantile(0.75)
+
+    def is_outlier(self, factor: float = 1.5) -> bool:
+        """
+        Checks whether the most recently added value lies outside the IQR bounds.
+
+        Parameters:
+            factor (float): The IQR multiplier used to define the outlier thresholds.
+
+        Returns:
+            bool: True if the latest value is an outlier, False otherwise.
+        """
+        q1, q3 = self.q1(), self.q3()
+        iqr_range = q3 - q1
+        latest = self.latest()
+        return latest < q1 - factor * iqr_range or latest > q3 + factor * iqr_range
+
+
+class StreamingDecomposer:
+    """
+    Incrementally decomposes a time series into trend, seasonal and residual components.
+
+    This is a streaming counterpart of the additive classical decomposition. The trend
+    is a trailing moving average over one seasonal period, and the seasonal component
+    is the running mean of the detrended values observed at each phase of the period,
+    centered to sum to zero across phases. The most recent residuals are kept in a
+    `RunningQuartiles` window, so the IQR check costs O(1) per query.
+
+    Attributes:
+        period (int): The seasonal period of the series.
+        t (int): The number of values pushed so far.
+    """
+
+    def __init__(self, period: int, window: int):
+        """
+        Initializes an empty streaming decomposer.
+
+        Parameters:
+            period (int): The seasonal period, an integer greater than 1.
+            window (int): The number of recent residuals kept for outlier detection.
+        """
+        self.period = period
+        self.t = 0
+
+        # Trailing moving average state
+        self._ma_window: Deque[float] = deque(maxlen=period)
+        self._ma_sum = 0.0
+
+        # Per-phase seasonal accumulators
+        self._season_sum = np.zeros(period)
+        self._season_cnt = np.zeros(period, dtype=np.int64)
+
+        self._residuals = RunningQuartiles(window)
+
+    def push(self, value: float) -> float:
+        """
+        Adds a new observation and returns its residual.
+
+        Parameters:
+            value (float): The new observation of the series.
+
+        Returns:
+            float: The residual of the new observation.
+        """
+        # Update the moving average window in O(1)
+        if len(self._ma_window) == self.period:
+            self._ma_sum -= self._ma_window[0]
+        self._ma_window.append(value)
+        self._ma_sum += value
+        trend = self._ma_sum / len(self._ma_window)
+
+        # Update the seasonal accumulator of the current phase
+        phase = self.t % self.period
+        self._season_sum[phase] += value - trend
+        self._season_cnt[phase] += 1
+
+        # Center the seasonal means over the phases observed so far
+        seen = self._season_cnt > 0
+        means = self._season_sum[seen] / self._season_cnt[seen]
+        seasonal = self._season_sum[phase] / self._season_cnt[phase] - means.mean()
+
+        residual = value - trend - seasonal
+        self._residuals.push(residual)
+        self.t += 1
+        return residual
+
+    def latest_residual(self) -> float:
+        """
+        Returns the residual of the most recent observation.
+        """
+        return self._residuals.latest()
+
+    def is_anomaly(self, iqr_factor: float = 1.5) -> bool:
+        """
+        Checks whether the most recent observation is an outlier.
+
+        Parameters:
+            iqr_factor (float): The IQR multiplier for outlier detection.
+
+        Returns:
+            bool: True if the latest residual is an outlier among the kept residuals.
+        """
+        return self._residuals.is_outlier(factor=iqr_factor)
@@ -13,15 +13,21 @@ Components:
 - `server`: The underlying Flask WSGI server for production environments like Gunicorn.
 - `layout`: The application's visual structure.
 - `register_callbacks`: The function to connect all interactive logic.
+- `init_app`: The function to bind the server-side session store.
 """
 
 # --- Imports ---
+# Standard library
+import threading
+
 # Third-party libraries
 from dash import Dash
 
 # Local application modules
-from src.layout import layout
+from src.layout import layout, validation_layout
 from src.callbacks import register_callbacks
+from src.session_store import init_app
+from src.sim import warmup
 
 # --- App Initialization ---
 # Initialize the Dash application with a unique name.
@@ -29,16 +35,28 @@ from src.callbacks import register_callbacks
 app = Dash(__name__)
 app.title = "Economic Network"
 
+# --- Session Store ---
+# Bind the server-side store that keeps the state of the running simulations.
+init_app(app.server)
+
 # --- Layout Assignment ---
 # Assign the application's layout, which defines the HTML structure.
 # This layout is imported from the src.layout module.
 app.layout = layout
+# The dashboard is only mounted while a simulation runs, so the callbacks
+# targeting it are validated against the complete component tree.
+app.validation_layout = validation_layout
 
 # --- Callback Registration ---
 # Register all callback functions with the Dash app.
 # Callbacks are the core logic that makes the app interactive.
 register_callbacks(app)
 
+# --- Warm-up ---
+# Compile the simulation kernels in a background thread, so the worker is
+# responsive right away and the first simulation step does not pay the JIT cost.
+threading.Thread(target=warmup, name="warmup", daemon=True).start()
+
 # --- Deployment Entry Point ---
 # Expose the underlying Flask server for production deployment.
 # This is the entry point used by web servers like Gunicorn or uWSGI.
@@ -6,28 +6,350 @@ update the system state, and generate interactive visualizations within the app.
 
 The callbacks handle:
 - Simulation start/stop control and screen navigation.
-- Periodic updates of the economic data via a hidden `dcc.Interval` component.
-- Real-time generation of a heatmap and time-series plot.
-- Management of the simulation state, which is stored in a serialized format.
+- Periodic updates of the economic data via a hidden `dcc.Interval` component,
+  paused while the browser tab is hidden.
+- Generation of a heatmap and time-series plot on start, and their real-time
+  update through partial `Patch` updates carrying only the newest sample.
+- Management of the simulation state, which is kept in a server-side session store.
 """
 
 # --- Imports ---
 # Standard library imports
-import json
-from typing import Tuple, List, Optional, Any
-from collections import deque
+import copy
+from typing import Tuple, List, Optional
 
 # Third-party library imports
 import numpy as np
 import plotly.graph_objs as go
-from dash import Input, Output, State, callback_context, no_update
+from dash import Input, Output, Patch, State, html, no_update
 from dash.exceptions import PreventUpdate
 from plotly.subplots import make_subplots
 
 # Local application imports
+from src.layout import build_dashboard
+from src.session_store import create_session, delete_session, load_session, save_session, session_lock
 from src.sim import EconomicNetwork
 
 
+# --- Figure Layout ---
+# Indices of the traces in the propensity graph, which are updated in place on
+# every simulation step instead of rebuilding the figure.
+_OMEGAH_LINE, _OMEGAF_LINE, _OMEGAH_MARKERS, _OMEGAF_MARKERS, _OMEGAH_STARS, _OMEGAF_STARS = range(6)
+
+
+# Static styling of the heatmap, built once; only its `z` cells change during a simulation.
+_HEATMAP_TEMPLATE = go.Figure(data=go.Heatmap(
+    z=[[0.0, 0.0], [0.0, 0.0]],
+    x=['household', 'firm'],
+    y=['household', 'firm'],
+    colorscale=[[0.0, "#fff59d"], [0.25, "#FAF9F6"], [1.0, "#cba6f7"]],
+    text=[['savings_household', 'consumption'], ['wage', 'savings_firm']],
+    texttemplate="%{text}<br>(%{z:.2%})",
+    hoverinfo='none',
+    textfont={"size": 16, "color": "#4a4a4a"},
+    zmin=0,
+    zmax=1,
+)).update_layout(
+    plot_bgcolor='rgba(0,0,0,0)', paper_bgcolor='rgba(0,0,0,0)'
+).update_yaxes(autorange="reversed").to_plotly_json()
+
+
+def _tick_text(t_vals: List[int]) -> List[str]:
+    """
+    Formats the relative timesteps shown on the time series axis.
+
+    Parameters:
+        t_vals (List[int]): The relative timesteps, the latest one being 0.
+
+    Returns:
+        List[str]: The tick labels, with the latest timestep labelled "now".
+    """
+    return [str(v) if v != 0 else "now" for v in t_vals]
+
+
+def _latest(econ: EconomicNetwork, key: str) -> float:
+    """
+    Returns the latest value of a propensity, rounded as it is plotted.
+
+    Parameters:
+        econ (EconomicNetwork): The simulation instance.
+        key (str): The propensity name ('omegah' or 'omegaf').
+
+    Returns:
+        float: The latest propensity value, rounded to two decimals.
+    """
+    return float(np.round(econ.get_values(key)[-1], 2))
+
+
+def build_heatmap_figure(econ: EconomicNetwork) -> dict:
+    """
+    Builds the heatmap of the normalized economic matrix.
+
+    The figure is a copy of the static `_HEATMAP_TEMPLATE` with the current matrix
+    filled in, so no Plotly objects are constructed per simulation.
+
+    Parameters:
+        econ (EconomicNetwork): The simulation instance.
+
+    Returns:
+        dict: The heatmap figure.
+    """
+    fig_heatmap = copy.deepcopy(_HEATMAP_TEMPLATE)
+    fig_heatmap['data'][0]['z'] = econ.get_matrix().tolist()
+    return fig_heatmap
+
+
+def _propensity_template() -> dict:
+    """
+    Builds the static part of the propensity graph: subplots, styling and empty traces.
+
+    The figure has a fixed set of traces (see the `_OMEGAH_LINE`... indices), whose
+    data is filled in by `build_propensity_figure`.
+
+    Returns:
+        dict: The propensity graph figure, without data.
+    """
+    fig_combined = make_subplots(
+        rows=1, cols=2, column_widths=[0.7, 0.3], horizontal_spacing=0.10
+    )
+
+    # Time series plot (left subplot)
+    fig_combined.add_trace(go.Scatter(x=[], y=[], name='Ωʰ', mode='lines', hoverinfo='none', showlegend=False),
+                           row=1, col=1)
+    fig_combined.add_trace(go.Scatter(x=[], y=[], name='Ωᶠ', mode='lines', hoverinfo='none', showlegend=False),
+                           row=1, col=1)
+    fig_combined.update_xaxes(
+        title_text='Time (t)',
+        dtick=1,
+        tickvals=[],
+        ticktext=[],
+        showgrid=True,
+        gridcolor='lightgrey',
+        row=1,
+        col=1
+    )
+    fig_combined.update_yaxes(title_text='Value',
+                              range=[0, 1],
+                              showgrid=True,
+                              gridcolor='lightgrey',
+                              row=1,
+                              col=1)
+
+    # Latest value plot (right subplot)
+    fig_combined.add_trace(
+        go.Scatter(x=[], y=[], mode='markers',
+                   marker=dict(color='blue', size=5), name='Ωʰ', hoverinfo='none', showlegend=False),
+        row=1, col=2
+    )
+    fig_combined.add_trace(
+        go.Scatter(x=[], y=[], mode='markers',
+                   marker=dict(color='red', size=5), name='Ωᶠ', hoverinfo='none', showlegend=False),
+        row=1, col=2
+    )
+    fig_combined.update_xaxes(
+        range=[0.5, 2.5], tickvals=[1, 1.8], ticktext=['Ωʰ', 'Ωᶠ'],
+        showgrid=False, zeroline=False, showticklabels=True, row=1, col=2
+    )
+    fig_combined.update_yaxes(
+        title_text='', range=[0, 1],
+        showgrid=False, showticklabels=False, row=1, col=2
+    )
+
+    # Add reference lines and hidden legend entry for outliers
+    fig_combined.add_shape(type='line', x0=1, x1=1, y0=0, y1=1,
+                           line=dict(color='blue', width=1, dash='dash'),
+                           row=1, col=2)
+    fig_combined.add_shape(type='line', x0=1.8, x1=1.8, y0=0, y1=1,
+                           line=dict(color='red', width=1, dash='dash'),
+                           row=1, col=2)
+
+    # --- Annotation per Outlier ---
+    fig_combined.add_annotation(
+        x=0.77,
+        y=0.95,
+        xref='paper',
+        yref='paper',
+        text="★<br>Outlier",
+        showarrow=False,
+        align='center',
+        font=dict(size=14, color="firebrick"),
+        xanchor='right',
+        yanchor='top'
+    )
+
+    # Highlight outliers with a star marker, one trace per propensity
+    for _ in range(2):
+        fig_combined.add_trace(
+            go.Scatter(x=[], y=[], mode='markers',
+                       marker=dict(color='firebrick', size=12, symbol='star'),
+                       hoverinfo='none',
+                       showlegend=False,
+                       cliponaxis=False),
+            row=1, col=1
+        )
+
+    fig_combined.update_layout(
+        title_text="Historical propensity data",
+        title_x=0.45,
+        title_y=0.88,
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        showlegend=True,
+        height=500,
+        width=585,
+        legend=dict(
+            x=0.75,
+            y=0.95,
+            xanchor='right',
+            yanchor='top',
+            bgcolor='rgba(255,255,255,0.5)',
+            bordercolor='black',
+            borderwidth=1
+        ),
+        # Keep the user's zoom and pan while the figure is patched on every tick
+        uirevision='propensity',
+    )
+    return fig_combined.to_plotly_json()
+
+
+_PROPENSITY_TEMPLATE = _propensity_template()
+
+
+def build_propensity_figure(econ: EconomicNetwork) -> dict:
+    """
+    Builds the combined time series figure of the propensity history.
+
+    The figure is a copy of the static `_PROPENSITY_TEMPLATE` with the history
+    filled in, so later simulation steps can be applied to it with
+    `patch_propensity_figure`.
+
+    Parameters:
+        econ (EconomicNetwork): The simulation instance.
+
+    Returns:
+        dict: The propensity graph figure.
+    """
+    # Extract data from history for plotting
+    # Plotly receives plain lists, so that the traces can later be extended by `Patch`
+    t_vals = np.arange(-len(econ) + 1, 1).tolist()
+    omegah_vals = np.round(econ.get_values('omegah'), 2).tolist()
+    omegaf_vals = np.round(econ.get_values('omegaf'), 2).tolist()
+
+    # Outliers are plotted as gaps (None) everywhere except at the outlier timesteps
+    omegah_stars = [v if is_out else None for v, is_out in zip(omegah_vals, econ.get_outliers('omegah').tolist())]
+    omegaf_stars = [v if is_out else None for v, is_out in zip(omegaf_vals, econ.get_outliers('omegaf').tolist())]
+
+    fig_combined = copy.deepcopy(_PROPENSITY_TEMPLATE)
+    for index, x, y in (
+        (_OMEGAH_LINE, t_vals, omegah_vals),
+        (_OMEGAF_LINE, t_vals, omegaf_vals),
+        (_OMEGAH_MARKERS, [1] * len(omegah_vals), omegah_vals),
+        (_OMEGAF_MARKERS, [1.8] * len(omegaf_vals), omegaf_vals),
+        (_OMEGAH_STARS, t_vals, omegah_stars),
+        (_OMEGAF_STARS, t_vals, omegaf_stars),
+    ):
+        fig_combined['data'][index]['x'] = list(x)
+        fig_combined['data'][index]['y'] = y
+
+    xaxis = fig_combined['layout']['xaxis']
+    xaxis['tickvals'] = t_vals
+    xaxis['ticktext'] = _tick_text(t_vals)
+    xaxis['range'] = [min(t_vals), max(t_vals)]
+    return fig_combined
+
+
+def patch_heatmap_figure(econ: EconomicNetwork) -> Patch:
+    """
+    Updates the heatmap built by `build_heatmap_figure` with the latest economic matrix.
+
+    Parameters:
+        econ (EconomicNetwork): The simulation instance.
+
+    Returns:
+        Patch: A partial update replacing the four heatmap cells.
+    """
+    patch = Patch()
+    patch['data'][0]['z'] = econ.get_matrix().tolist()
+    return patch
+
+
+def patch_propensity_figure(econ: EconomicNetwork, grew: bool) -> Patch:
+    """
+    Appends the latest simulation step to the figure built by `build_propensity_figure`.
+
+    Only the newest sample of every trace is sent to the browser. Once the history
+    is full, the oldest sample is dropped; while it is still filling up, the time
+    axis is extended one timestep further into the past instead.
+
+    Parameters:
+        econ (EconomicNetwork): The simulation instance, already advanced by one step.
+        grew (bool): Whether the step increased the length of the history.
+
+    Returns:
+        Patch: A partial update of the propensity graph.
+    """
+    omegah = _latest(econ, 'omegah')
+    omegaf = _latest(econ, 'omegaf')
+    omegah_star = omegah if econ.get_outliers('omegah')[-1] else None
+    omegaf_star = omegaf if econ.get_outliers('omegaf')[-1] else None
+
+    patch = Patch()
+    for index, value in (
+        (_OMEGAH_LINE, omegah),
+        (_OMEGAF_LINE, omegaf),
+        (_OMEGAH_MARKERS, omegah),
+        (_OMEGAF_MARKERS, omegaf),
+        (_OMEGAH_STARS, omegah_star),
+        (_OMEGAF_STARS, omegaf_star),
+    ):
+        if not grew:
+            del patch['data'][index]['y'][0]
+        patch['data'][index]['y'].append(value)
+
+    if grew:
+        # Extend the relative time axis with the new oldest timestep
+        t_min = -len(econ) + 1
+        for index in (_OMEGAH_LINE, _OMEGAF_LINE, _OMEGAH_STARS, _OMEGAF_STARS):
+            patch['data'][index]['x'].prepend(t_min)
+        patch['data'][_OMEGAH_MARKERS]['x'].append(1)
+        patch['data'][_OMEGAF_MARKERS]['x'].append(1.8)
+        patch['layout']['xaxis']['tickvals'].prepend(t_min)
+        patch['layout']['xaxis']['ticktext'].prepend(str(t_min))
+        patch['layout']['xaxis']['range'] = [t_min, 0]
+    return patch
+
+
+def _pending_override(mirror: Optional[dict], sync: Optional[dict]) -> Optional[float]:
+    """
+    Returns the value set by the user on a slider that has not been applied yet.
+
+    Parameters:
+        mirror (Optional[dict]): The latest user value of the slider and its number.
+        sync (Optional[dict]): The latest synced value of the slider and the number
+                               of the last applied user value.
+
+    Returns:
+        Optional[float]: The value to override the propensity with, if any.
+    """
+    if mirror is None or (sync is not None and mirror['n'] == sync['applied']):
+        return None
+    return mirror['value']
+
+
+def _sync(value: float, mirror: Optional[dict]) -> dict:
+    """
+    Builds the synced state of a slider after a simulation step.
+
+    Parameters:
+        value (float): The latest propensity, as written back to the slider.
+        mirror (Optional[dict]): The user value of the slider read by the step, if any.
+
+    Returns:
+        dict: The synced value and the number of the last applied user value.
+    """
+    return {'value': value, 'applied': mirror['n'] if mirror is not None else 0}
+
+
 def register_callbacks(app) -> None:
     """
     Registers the Dash callbacks to control the simulation and update the UI.
@@ -39,17 +361,8 @@ def register_callbacks(app) -> None:
         Output('screen', 'data'),
         Output('econ-store', 'data'),
         Output('interval-update', 'disabled'),
-        Output('matrix-graph', 'figure'),
-        Output('propensity-graph', 'figure'),
-        Output('omegah-output', 'value'),
-        Output('omegaf-output', 'value'),
+        Output('dashboard', 'children'),
         Input('start_btn', 'n_clicks'),
-        Input('stop_btn', 'n_clicks'),
-        Input('interval-update', 'n_intervals'),
-        Input('omegah-output', 'value'),
-        Input('omegaf-output', 'value'),
-        State('screen', 'data'),
-        State('econ-store', 'data'),
         State('savings_household_input', 'value'),
         State('savings_firm_input', 'value'),
         State('omegah_input', 'value'),
@@ -58,36 +371,24 @@ def register_callbacks(app) -> None:
         State('memory_input', 'value'),
         prevent_initial_call=True,
     )
-    def control_and_update(
+    def start_simulation(
             start_clicks: int,
-            stop_clicks: int,
-            n_intervals: int,
-            omegah_slider: Optional[float],
-            omegaf_slider: Optional[float],
-            screen: str,
-            econ_data: Optional[str],
             savings_household: float,
             savings_firm: float,
             omegah_input: float,
             omegaf_input: float,
             volatility_input: float,
             memory_input: int,
-    ) -> Tuple[str, Optional[str], bool, go.Figure, go.Figure, Optional[float], Optional[float]]:
+    ) -> Tuple[str, str, bool, html.Div]:
         """
-        Manages the simulation lifecycle and updates the UI based on user interactions and time intervals.
+        Starts a new simulation and switches to the simulation screen.
 
-        This callback is the central hub for the application logic. It handles
-        the transition between the 'setup' and 'simulation' screens, initializes
-        and updates the economic model, and generates the figures for the dashboard.
+        The economic model is initialized and kept in the server-side session
+        store, and the dashboard is mounted with its figures built once; later
+        steps only patch them (see `update_simulation`).
 
         Parameters:
             start_clicks (int): Number of clicks on the 'Start simulation' button.
-            stop_clicks (int): Number of clicks on the 'Stop and go back' button.
-            n_intervals (int): The number of intervals elapsed since the simulation started.
-            omegah_slider (Optional[float]): The current value of the omegah slider.
-            omegaf_slider (Optional[float]): The current value of the omegaf slider.
-            screen (str): The current screen being displayed ('setup' or 'sim').
-            econ_data (Optional[str]): A JSON-serialized string of the simulation's history.
             savings_household (float): The value from the household savings input.
             savings_firm (float): The value from the firm savings input.
             omegah_input (float): The value from the initial omegah input field.
@@ -98,250 +399,236 @@ def register_callbacks(app) -> None:
         Returns:
             Tuple: A tuple containing the updated state for the following outputs:
                    - screen data
-                   - serialized economic data
+                   - session id
                    - interval disabled flag
-                   - heatmap figure
-                   - propensity graph figure
-                   - omegah slider value
-                   - omegaf slider value
+                   - dashboard graphs and sliders
         """
-        ctx = callback_context
-        if not ctx.triggered:
+        # --- Input Validation ---
+        inputs = [
+            omegah_input,
+            omegaf_input,
+            savings_household,
+            savings_firm,
+            volatility_input,
+            memory_input
+        ]
+
+        if any(v is None for v in inputs):
             raise PreventUpdate
 
-        trigger_id = ctx.triggered[0]['prop_id'].split('.')[0]
-
-        # Handle the start button click
-        if trigger_id == 'start_btn':
-            # --- Input Validation ---
-            inputs = [
-                omegah_input,
-                omegaf_input,
-                savings_household,
-                savings_firm,
-                volatility_input,
-                memory_input
-            ]
-
-            if any(v is None for v in inputs):
-                raise PreventUpdate
-
-            # Initialize a new EconomicNetwork instance with user-provided parameters
-            econ = EconomicNetwork(
-                volatility_input,
-                memory_input,
-                [omegah_input, omegaf_input],
-                [savings_household, savings_firm],
-            )
-
-            # Serialize and store the initial simulation history
-            data = json.dumps(list(econ.history))
-
-            # Transition to the simulation screen and enable periodic updates
-            return 'sim', data, False, go.Figure(), go.Figure(), omegah_input, omegaf_input
-
-        # Handle the stop button click
-        elif trigger_id == 'stop_btn':
-            # Return to the setup screen and disable the interval
-            return 'setup', None, True, go.Figure(), go.Figure(), None, None
-
-        # Handle simulation updates or slider changes
-        elif trigger_id in {'interval-update', 'omegah-output', 'omegaf-output'} and screen == 'sim':
-            if not econ_data:
-                raise PreventUpdate
-
-            # Reconstruct the EconomicNetwork instance from the serialized data
-            history_list = json.loads(econ_data)
-            last_state = history_list[-1]
-
-            # Re-initialize the model with the last known parameters
-            econ = EconomicNetwork(
-                volatility_input,
-                memory_input,
-                [last_state["omegah"], last_state["omegaf"]],
-                [last_state["savings_household"], last_state["savings_firm"]],
-                last_state.get("consumption", 0),
-                last_state.get("wage", 0),
-            )
-            # Restore the full history
-            econ.history = deque(history_list, maxlen=memory_input)
-
-            # Determine if a slider override is active
-            omegah_override = omegah_slider if trigger_id == 'omegah-output' else None
-            omegaf_override = omegaf_slider if trigger_id == 'omegaf-output' else None
+        # Initialize a new EconomicNetwork instance with user-provided parameters
+        econ = EconomicNetwork(
+            volatility_input,
+            memory_input,
+            [omegah_input, omegaf_input],
+            [savings_household, savings_firm],
+        )
 
-            # Advance the simulation by one step
-            econ.step(omegah_override=omegah_override, omegaf_override=omegaf_override)
+        # Store the simulation on the server, keeping only its session id in the browser
+        sid = create_session(econ)
 
-            # Reserialize the updated history
-            data = json.dumps(list(econ.history))
-
-            # --- Plot Generation ---
-            # Extract data from history for plotting
-            t_vals = list(range(-len(econ.history) + 1, 1))
-            omegah_vals = [round(s['omegah'], 2) for s in econ.history]
-            omegaf_vals = [round(s['omegaf'], 2) for s in econ.history]
-
-            # Extract outlier data for highlighting
-            omegah_outliers: List[Any] = econ.history[-1].get('outliers', {}).get('omegah', [])
-            omegaf_outliers: List[Any] = econ.history[-1].get('outliers', {}).get('omegaf', [])
-
-            # === Heatmap Figure ===
-            matrix = econ.get_matrix()
-            labels = np.array([['savings_household', 'consumption'], ['wage', 'savings_firm']])
-            fig_heatmap = go.Figure(data=go.Heatmap(
-                z=matrix,
-                x=['household', 'firm'],
-                y=['household', 'firm'],
-                colorscale=[[0.0, "#fff59d"], [0.25, "#FAF9F6"], [1.0, "#cba6f7"]],
-                text=labels,
-                texttemplate="%{text}<br>(%{z:.2%})",
-                hoverinfo='none',
-                textfont={"size": 16, "color": "#4a4a4a"},
-                zmin=0,
-                zmax=1,
-            ))
-            fig_heatmap.update_layout(plot_bgcolor='rgba(0,0,0,0)', paper_bgcolor='rgba(0,0,0,0)')
-            fig_heatmap.update_yaxes(autorange="reversed")
-
-            # === Combined Time Series Figure (Propensity Graph) ===
-            fig_combined = make_subplots(
-                rows=1, cols=2, column_widths=[0.7, 0.3], horizontal_spacing=0.10
-            )
-
-            # Time series plot (left subplot)
-            fig_combined.add_trace(go.Scatter(x=t_vals, y=omegah_vals, name='Ωʰ', mode='lines', hoverinfo='none', showlegend=False),
-                                   row=1, col=1)
-            fig_combined.add_trace(go.Scatter(x=t_vals, y=omegaf_vals, name='Ωᶠ', mode='lines', hoverinfo='none', showlegend=False),
-                                   row=1, col=1)
-            fig_combined.update_xaxes(
-                title_text='Time (t)',
-                dtick=1,
-                tickvals=t_vals,
-                ticktext=[str(v) if v != 0 else "now" for v in t_vals],
-                range=[min(t_vals), max(t_vals)],
-                showgrid=True,
-                gridcolor='lightgrey',
-                row=1,
-                col=1
-            )
-            fig_combined.update_yaxes(title_text='Value',
-                                      range=[0, 1],
-                                      showgrid=True,
-                                      gridcolor='lightgrey',
-                                      row=1,
-                                      col=1)
-
-            # Latest value plot (right subplot)
-            fig_combined.add_trace(
-                go.Scatter(x=[1] * len(omegah_vals), y=omegah_vals, mode='markers',
-                           marker=dict(color='blue', size=5), name='Ωʰ', hoverinfo='none', showlegend=False),
-                row=1, col=2
-            )
-            fig_combined.add_trace(
-                go.Scatter(x=[1.8] * len(omegaf_vals), y=omegaf_vals, mode='markers',
-                           marker=dict(color='red', size=5), name='Ωᶠ', hoverinfo='none', showlegend=False),
-                row=1, col=2
-            )
-            fig_combined.update_xaxes(
-                range=[0.5, 2.5], tickvals=[1, 1.8], ticktext=['Ωʰ', 'Ωᶠ'],
-                showgrid=False, zeroline=False, showticklabels=True, row=1, col=2
-            )
-            fig_combined.update_yaxes(
-                title_text='', range=[0, 1],
-                showgrid=False, showticklabels=False, row=1, col=2
-            )
-
-            # Add reference lines and hidden legend entry for outliers
-            fig_combined.add_shape(type='line', x0=1, x1=1, y0=0, y1=1,
-                                   line=dict(color='blue', width=1, dash='dash'),
-                                   row=1, col=2)
-            fig_combined.add_shape(type='line', x0=1.8, x1=1.8, y0=0, y1=1,
-                                   line=dict(color='red', width=1, dash='dash'),
-                                   row=1, col=2)
-
-            # --- Annotation per Outlier ---
-            fig_combined.add_annotation(
-                x=0.77,
-                y=0.95,
-                xref='paper',
-                yref='paper',
-                text="★<br>Outlier",
-                showarrow=False,
-                align='center',
-                font=dict(size=14, color="firebrick"),
-                xanchor='right',
-                yanchor='top'
-            )
-
-            # Highlight outliers with a star marker
-            for i, is_out in enumerate(omegah_outliers):
-                if is_out:
-                    fig_combined.add_trace(
-                        go.Scatter(x=[t_vals[i]], y=[omegah_vals[i]], mode='markers',
-                                   marker=dict(color='firebrick', size=12, symbol='star'),
-                                   hoverinfo='none',
-                                   showlegend=False,
-                                   cliponaxis=False),
-                        row=1, col=1
-                    )
-            for i, is_out in enumerate(omegaf_outliers):
-                if is_out:
-                    fig_combined.add_trace(
-                        go.Scatter(x=[t_vals[i]], y=[omegaf_vals[i]], mode='markers',
-                                   marker=dict(color='firebrick', size=12, symbol='star'),
-                                   hoverinfo='none',
-                                   showlegend=False,
-                                   cliponaxis=False),
-                        row=1, col=1
-                    )
-
-            fig_combined.update_layout(
-                title_text="Historical propensity data",
-                title_x=0.45,
-                title_y=0.88,
-                plot_bgcolor='rgba(0,0,0,0)',
-                paper_bgcolor='rgba(0,0,0,0)',
-                showlegend=True,
-                height=500,
-                width=585,
-                legend=dict(
-                    x=0.75,
-                    y=0.95,
-                    xanchor='right',
-                    yanchor='top',
-                    bgcolor='rgba(255,255,255,0.5)',
-                    bordercolor='black',
-                    borderwidth=1
-                )
-            )
-
-            return screen, data, False, fig_heatmap, fig_combined, omegah_vals[-1], omegaf_vals[-1]
-
-        else:
-            raise PreventUpdate
+        # Transition to the simulation screen and enable periodic updates
+        return 'sim', sid, False, build_dashboard(
+            build_heatmap_figure(econ), build_propensity_figure(econ),
+            _latest(econ, 'omegah'), _latest(econ, 'omegaf'),
+        )
+
+    @app.callback(
+        Output('screen', 'data', allow_duplicate=True),
+        Output('econ-store', 'data', allow_duplicate=True),
+        Output('interval-update', 'disabled', allow_duplicate=True),
+        Output('dashboard', 'children', allow_duplicate=True),
+        Input('stop_btn', 'n_clicks'),
+        State('econ-store', 'data'),
+        prevent_initial_call=True,
+    )
+    def stop_simulation(
+            stop_clicks: int,
+            sid: Optional[str],
+    ) -> Tuple[str, None, bool, list]:
+        """
+        Stops the running simulation and goes back to the setup screen.
+
+        The dashboard is unmounted, so no graph is kept alive off-screen.
+
+        Parameters:
+            stop_clicks (int): Number of clicks on the 'Stop and go back' button.
+            sid (Optional[str]): The session id of the running simulation, if any.
+
+        Returns:
+            Tuple: A tuple containing the reset state for the same outputs as
+                   `start_simulation`.
+        """
+        if sid:
+            # A tick in flight finishes saving first, so it cannot bring the session back
+            with session_lock(sid):
+                delete_session(sid)
+
+        # Return to the setup screen, disable the interval and unmount the dashboard
+        return 'setup', None, True, []
 
     @app.callback(
-        Output('setup-screen', 'style'),
-        Output('sim-screen', 'style'),
-        Input('screen', 'data')
+        Output('matrix-graph', 'figure', allow_duplicate=True),
+        Output('propensity-graph', 'figure', allow_duplicate=True),
+        Output('omegah-output', 'value', allow_duplicate=True),
+        Output('omegaf-output', 'value', allow_duplicate=True),
+        Output('omegah-slider-sync', 'data'),
+        Output('omegaf-slider-sync', 'data'),
+        Output('screen', 'data', allow_duplicate=True),
+        Output('econ-store', 'data', allow_duplicate=True),
+        Output('interval-update', 'disabled', allow_duplicate=True),
+        Output('dashboard', 'children', allow_duplicate=True),
+        Input('interval-update', 'n_intervals'),
+        State('omegah-slider-mirror', 'data'),
+        State('omegaf-slider-mirror', 'data'),
+        State('omegah-slider-sync', 'data'),
+        State('omegaf-slider-sync', 'data'),
+        State('screen', 'data'),
+        State('econ-store', 'data'),
+        prevent_initial_call=True,
     )
-    def toggle_screens(screen: str) -> Tuple[dict, dict]:
+    def update_simulation(
+            n_intervals: int,
+            omegah_mirror: Optional[dict],
+            omegaf_mirror: Optional[dict],
+            omegah_sync: Optional[dict],
+            omegaf_sync: Optional[dict],
+            screen: str,
+            sid: Optional[str],
+    ) -> Tuple[Patch, Patch, float, float, dict, dict, str, None, bool, list]:
         """
-        Toggles the visibility of the setup and simulation screens.
+        Advances the simulation by one step on every interval tick.
 
-        This callback ensures that only one of the main screens is visible at any given time.
+        Instead of rebuilding the figures, only the newest sample is sent to the
+        browser as a partial `Patch` update of the figures built on start.
+
+        Dragging a slider does not reach the server: the value set by the user is
+        kept in the slider's mirror store in the browser, and overrides the
+        propensity on the next tick, so it applies with up to one interval of
+        latency. Every tick writes the latest propensities back to the sliders,
+        and records them in the sync stores, so those writes are not mistaken for
+        user values and cannot discard a value set while the tick is in flight.
+        The heatmap and sliders are left untouched when their displayed values
+        have not changed.
+
+        If the session has expired or its store was wiped, the simulation is
+        stopped and the user is sent back to the setup screen, as with the
+        'Stop and go back' button.
 
         Parameters:
-            screen (str): The current screen identifier ('setup' or 'sim').
+            n_intervals (int): The number of intervals elapsed since the simulation started.
+            omegah_mirror (Optional[dict]): The latest user value of the omegah slider.
+            omegaf_mirror (Optional[dict]): The latest user value of the omegaf slider.
+            omegah_sync (Optional[dict]): The synced state of the omegah slider.
+            omegaf_sync (Optional[dict]): The synced state of the omegaf slider.
+            screen (str): The current screen being displayed ('setup' or 'sim').
+            sid (Optional[str]): The session id of the running simulation.
 
         Returns:
-            Tuple: A tuple of two dictionaries, containing the style properties
-                   for the setup and simulation screens, respectively.
+            Tuple: A tuple containing the updated state for the following outputs:
+                   - heatmap figure patch, or `no_update`
+                   - propensity graph figure patch
+                   - omegah slider value, or `no_update`
+                   - omegaf slider value, or `no_update`
+                   - omegah slider synced state
+                   - omegaf slider synced state
+                   - screen data, session id, interval disabled flag and dashboard,
+                     which are only set when the session is missing (see `stop_simulation`)
+        """
+        if screen != 'sim' or not sid:
+            raise PreventUpdate
+
+        # Apply the values set by the user on the sliders since the last tick
+        omegah_override = _pending_override(omegah_mirror, omegah_sync)
+        omegaf_override = _pending_override(omegaf_mirror, omegaf_sync)
+
+        # Overlapping ticks of the session share its instance, so they advance it one at a time
+        with session_lock(sid):
+            # Retrieve the EconomicNetwork instance from the session store
+            econ = load_session(sid)
+            if econ is None:
+                return (no_update,) * 6 + ('setup', None, True, [])
+            length = len(econ)
+
+            # Heatmap cells as they are displayed, to percent precision
+            cells = np.round(econ.get_matrix(), 4)
+
+            # Advance the simulation by one step
+            econ.step(omegah_override=omegah_override, omegaf_override=omegaf_override)
+
+            # Store the updated simulation state
+            save_session(sid, econ)
+
+            # --- Plot Updates ---
+            # Outputs that would not change on screen are skipped, so the browser
+            # does not redraw them
+            if np.array_equal(np.round(econ.get_matrix(), 4), cells):
+                fig_heatmap = no_update
+            else:
+                fig_heatmap = patch_heatmap_figure(econ)
+            fig_combined = patch_propensity_figure(econ, grew=len(econ) > length)
+            omegah = _latest(econ, 'omegah')
+            omegaf = _latest(econ, 'omegaf')
+
+        omegah_synced = omegah_sync['value'] if omegah_sync is not None else None
+        omegaf_synced = omegaf_sync['value'] if omegaf_sync is not None else None
+
+        return (
+            fig_heatmap, fig_combined,
+            omegah if omegah != omegah_synced else no_update,
+            omegaf if omegaf != omegaf_synced else no_update,
+            _sync(omegah, omegah_mirror),
+            _sync(omegaf, omegaf_mirror),
+            no_update, no_update, no_update, no_update,
+        )
+
+    # Mirror the values set by the user on the sliders. A slider value equal to
+    # its synced value was written back by a tick, not set by the user.
+    for key in ('omegah', 'omegaf'):
+        app.clientside_callback(
+            """
+            function(value, sync, mirror) {
+                if (value === null || value === undefined || (sync && value === sync.value)) {
+                    return window.dash_clientside.no_update;
+                }
+                return {value: value, n: (mirror ? mirror.n : 0) + 1};
+            }
+            """,
+            Output(f'{key}-slider-mirror', 'data'),
+            Input(f'{key}-output', 'value'),
+            State(f'{key}-slider-sync', 'data'),
+            State(f'{key}-slider-mirror', 'data'),
+            prevent_initial_call=True,
+        )
+
+    # Pause the simulation interval while the browser tab is hidden
+    app.clientside_callback(
+        """
+        function(visibility, screen) {
+            return visibility === 'hidden' || screen !== 'sim';
+        }
+        """,
+        Output('interval-update', 'disabled', allow_duplicate=True),
+        Input('page-visibility', 'data'),
+        State('screen', 'data'),
+        prevent_initial_call=True,
+    )
+
+    # Toggle the visibility of the setup and simulation screens in the browser,
+    # so that only one of the main screens is visible at any given time
+    app.clientside_callback(
         """
-        if screen == 'setup':
-            return {'display': 'block'}, {'display': 'none'}
-        elif screen == 'sim':
-            return {'display': 'none'}, {'display': 'block'}
-        else:
-            return no_update, no_update
+        function(screen) {
+            if (screen === 'setup') {
+                return ['', 'hidden'];
+            } else if (screen === 'sim') {
+                return ['hidden', ''];
+            }
+            return [window.dash_clientside.no_update, window.dash_clientside.no_update];
+        }
+        """,
+        Output('setup-screen', 'className'),
+        Output('sim-screen', 'className'),
+        Input('screen', 'data'),
+        prevent_initial_call=True,  # The initial class names already show the setup screen
+    )
@@ -12,8 +12,96 @@ updates via callbacks.
 """
 
 # --- Imports ---
+# Standard library imports
+from typing import Optional
+
+# Third-party library imports
 from dash import dcc, html
 
+# --- Shared Styles ---
+# Form labels, inputs and rows are styled through the CSS classes of
+# assets/styles.css; the remaining shared style dictionaries are defined once.
+_GRAPH_STYLE = {'height': '600px', 'width': '100%'}
+
+# --- Graph Configurations ---
+# The mode bar is never used. The heatmap has no hover or zoom interactions, so it
+# is rendered as a static plot without any of Plotly's event handlers.
+_GRAPH_CONFIG = {'displayModeBar': False}
+_STATIC_GRAPH_CONFIG = {**_GRAPH_CONFIG, 'staticPlot': True}
+
+# --- Slider Properties ---
+# Shared by both propensity sliders. The tooltip is only rendered while a slider
+# is hovered or dragged, and only the settled value of a drag is reported.
+_SLIDER_PROPS = {
+    'min': 0.01,
+    'max': 0.99,
+    'step': 0.01,
+    'marks': {0.01: '0.01', 0.99: '0.99'},
+    'tooltip': {'always_visible': False, 'placement': 'bottom'},
+    'updatemode': 'mouseup',
+    'className': 'danger-gradient-slider',
+}
+
+# --- Dashboard Builder ---
+def build_dashboard(
+        matrix_figure: Optional[dict] = None,
+        propensity_figure: Optional[dict] = None,
+        omegah: float = 0.5,
+        omegaf: float = 0.5,
+) -> html.Div:
+    """
+    Builds the graphs and sliders of the simulation dashboard.
+
+    The dashboard is only mounted into the `dashboard` container when a
+    simulation starts, and unmounted when it stops, so the page loads without
+    instantiating any graph.
+
+    Parameters:
+        matrix_figure (Optional[dict]): The initial heatmap figure.
+        propensity_figure (Optional[dict]): The initial propensity graph figure.
+        omegah (float): The initial value of the omegah slider.
+        omegaf (float): The initial value of the omegaf slider.
+
+    Returns:
+        html.Div: The dashboard component tree.
+    """
+    return html.Div([
+        # --- Slider Stores ---
+        # For each propensity, the mirror holds the latest value set by the user
+        # on its slider, numbered so that each one is applied once, and the sync
+        # holds the latest value written back to the slider by the simulation,
+        # along with the number of the last applied user value.
+        dcc.Store(id='omegah-slider-mirror', data=None),
+        dcc.Store(id='omegaf-slider-mirror', data=None),
+        dcc.Store(id='omegah-slider-sync', data={'value': omegah, 'applied': 0}),
+        dcc.Store(id='omegaf-slider-sync', data={'value': omegaf, 'applied': 0}),
+
+        # Economic matrix graph (left side)
+        html.Div(
+            [dcc.Graph(id='matrix-graph',
+                       figure=matrix_figure or {},
+                       style=_GRAPH_STYLE,
+                       config=_STATIC_GRAPH_CONFIG)],
+            style={'width': '60%', 'display': 'inline-block', 'verticalAlign': 'top'}
+        ),
+
+        # Controls and propensity graph (right side)
+        html.Div(
+            [
+                html.Label("Ωʰ (editable):", className='field-label'),
+                dcc.Slider(id='omegah-output', value=omegah, **_SLIDER_PROPS),
+                html.Label("Ωᶠ (editable):", className='field-label'),
+                dcc.Slider(id='omegaf-output', value=omegaf, **_SLIDER_PROPS),
+                dcc.Graph(id='propensity-graph',
+                          figure=propensity_figure or {},
+                          style=_GRAPH_STYLE,
+                          config=_GRAPH_CONFIG),
+            ],
+            style={'width': '38%', 'display': 'inline-block', 'verticalAlign': 'top', 'paddingLeft': '2%'}
+        ),
+    ])
+
+
 # --- Layout Definition ---
 # The main layout is a single Div that contains all the application's components.
 layout = html.Div(
@@ -23,12 +111,16 @@ layout = html.Div(
         # for storing data and state that needs to be shared between callbacks.
         dcc.Store(
             id='econ-store',
-            data=None,  # This will store the serialized EconomicNetwork object.
+            data=None,  # This will store the session id of the server-side EconomicNetwork object.
         ),
         dcc.Store(
             id='screen',
             data='setup',  # Controls which screen ('setup' or 'sim') is visible.
         ),
+        dcc.Store(
+            id='page-visibility',
+            data='visible',  # Visibility state of the browser tab, set by assets/visibility.js.
+        ),
         dcc.Interval(
             id='interval-update',
             interval=2000,  # Interval in milliseconds (2s)
@@ -43,9 +135,10 @@ layout = html.Div(
                 html.H1("Economic Network - Setup"),
                 html.P("Initial economic network parameters adjustment."),
 
-                # --- Initial propensities (omegah and omegaf) ---
+                # --- Parameter fields, laid out by the CSS grid of `form-grid` ---
                 html.Div([
-                    html.Label("Initial consumption propensity (Ωʰ):", style={'fontWeight': 'bold'}),
+                    # --- Initial propensities (omegah and omegaf) ---
+                    html.Label("Initial consumption propensity (Ωʰ):", className='field-label'),
                     dcc.Input(
                         id='omegah_input',
                         type='number',
@@ -54,12 +147,9 @@ layout = html.Div(
                         min=0.01,
                         max=0.99,
                         step=0.01,
-                        style={'display': 'block', 'width': '100%'}
+                        className='field-input'
                     ),
-                ], style={'marginBottom': '15px'}),
-
-                html.Div([
-                    html.Label("Initial salary payment propensity (Ωᶠ):", style={'fontWeight': 'bold'}),
+                    html.Label("Initial salary payment propensity (Ωᶠ):", className='field-label'),
                     dcc.Input(
                         id='omegaf_input',
                         type='number',
@@ -68,13 +158,11 @@ layout = html.Div(
                         min=0.01,
                         max=0.99,
                         step=0.01,
-                        style={'display': 'block', 'width': '100%'}
+                        className='field-input'
                     ),
-                ], style={'marginBottom': '15px'}),
 
-                # --- Initial savings inputs ---
-                html.Div([
-                    html.Label("Initial household savings:", style={'fontWeight': 'bold'}),
+                    # --- Initial savings inputs ---
+                    html.Label("Initial household savings:", className='field-label'),
                     dcc.Input(
                         id='savings_household_input',
                         type='number',
@@ -82,12 +170,9 @@ layout = html.Div(
                         value=100,
                         step=1,
                         min=0,
-                        style={'display': 'block', 'width': '100%'}
+                        className='field-input'
                     ),
-                ], style={'marginBottom': '15px'}),
-
-                html.Div([
-                    html.Label("Initial firm savings:", style={'fontWeight': 'bold'}),
+                    html.Label("Initial firm savings:", className='field-label'),
                     dcc.Input(
                         id='savings_firm_input',
                         type='number',
@@ -95,13 +180,11 @@ layout = html.Div(
                         value=0,
                         step=1,
                         min=0,
-                        style={'display': 'block', 'width': '100%'}
+                        className='field-input'
                     ),
-                ], style={'marginBottom': '15px'}),
 
-                # --- Volatility and memory inputs ---
-                html.Div([
-                    html.Label("Propensities volatility:", style={'fontWeight': 'bold'}),
+                    # --- Volatility and memory inputs ---
+                    html.Label("Propensities volatility:", className='field-label'),
                     dcc.Input(
                         id='volatility_input',
                         type='number',
@@ -110,12 +193,9 @@ layout = html.Div(
                         step=0.01,
                         min=0.01,
                         max=0.99,
-                        style={'display': 'block', 'width': '100%'}
+                        className='field-input field-input-wide'
                     ),
-                ], style={'marginBottom': '20px'}),
-
-                html.Div([
-                    html.Label("Time horizon:", style={'fontWeight': 'bold'}),
+                    html.Label("Time horizon:", className='field-label'),
                     dcc.Input(
                         id='memory_input',
                         type='number',
@@ -123,9 +203,9 @@ layout = html.Div(
                         value=5,
                         step=1,
                         min=3,
-                        style={'display': 'block', 'width': '100%'}
+                        className='field-input field-input-wide'
                     ),
-                ], style={'marginBottom': '20px'}),
+                ], className='form-grid'),
 
                 # --- Start simulation button ---
                 html.Button(
@@ -145,49 +225,15 @@ layout = html.Div(
                 html.H1("Economic Network - Dashboard"),
                 html.Button('Stop and go back', id='stop_btn', n_clicks=0),
 
-                html.Div([
-                    # Economic matrix graph (left side)
-                    html.Div(
-                        [dcc.Graph(id='matrix-graph',
-                                   style={'height': '600px', 'width': '100%'},
-                                   config={'displayModeBar': False})],
-                        style={'width': '60%', 'display': 'inline-block', 'verticalAlign': 'top'}
-                    ),
-
-                    # Controls and propensity graph (right side)
-                    html.Div(
-                        [
-                            html.Label("Ωʰ (editable):", style={'fontWeight': 'bold'}),
-                            dcc.Slider(
-                                id='omegah-output',
-                                min=0.01,
-                                max=0.99,
-                                step=0.01,
-                                value=0.5,
-                                marks={0.01: '0.01', 0.99: '0.99'},
-                                tooltip={"always_visible": True, "placement": "bottom"},
-                                className='danger-gradient-slider'
-                            ),
-                            html.Label("Ωᶠ (editable):", style={'fontWeight': 'bold'}),
-                            dcc.Slider(
-                                id='omegaf-output',
-                                min=0.01,
-                                max=0.99,
-                                step=0.01,
-                                value=0.5,
-                                marks={0.01: '0.01', 0.99: '0.99'},
-                                tooltip={"always_visible": True, "placement": "bottom"},
-                                className='danger-gradient-slider'
-                            ),
-                            dcc.Graph(id='propensity-graph',
-                                      style={'height': '600px', 'width': '100%'},
-                                      config={'displayModeBar': False}),
-                        ],
-                        style={'width': '38%', 'display': 'inline-block', 'verticalAlign': 'top', 'paddingLeft': '2%'}
-                    ),
-                ])
+                # Graphs and sliders, mounted by the start callback (see `build_dashboard`)
+                html.Div(id='dashboard', children=[]),
             ],
-            style={'display': 'none'}  # Hidden initially
+            className='hidden'  # Hidden initially
         ),
     ]
 )
+
+# --- Validation Layout ---
+# The complete component tree, including the dashboard that is only mounted at
+# runtime, so that Dash can validate the callbacks targeting its components.
+validation_layout = html.Div([layout, build_dashboard()])
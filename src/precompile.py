@@ -0,0 +1,29 @@
+"""
+Precompile Module for Interactive Economic Simulator.
+
+This module compiles every Numba kernel of the simulation once, so that their
+on-disk cache (located by the `NUMBA_CACHE_DIR` environment variable, or the
+`__pycache__` folder of `src` by default) is populated ahead of deployment.
+
+It is meant to be run as part of the build, before the web workers start:
+
+    python -m src.precompile
+"""
+
+# --- Imports ---
+# Local application imports
+from src.sim import warmup
+from src.sim_kernels import simulate_many
+
+
+def precompile() -> None:
+    """
+    Compiles and caches the simulation kernels, including the parallel batch driver.
+    """
+    warmup()
+    simulate_many(2, 3, 0.5, 0.5, 1.0, 1.0, 0.01)
+
+
+# --- Build Entry Point ---
+if __name__ == "__main__":
+    precompile()
@@ -0,0 +1,222 @@
+"""
+Session Store Module for Interactive Economic Simulator.
+
+This module keeps the `EconomicNetwork` instance of every running simulation on
+the server, so the browser only has to hold a short session id in its
+`dcc.Store` instead of the serialized simulation history.
+
+The state is kept in a Flask-Caching store, which is bound to the Flask server
+of the Dash application with `init_app`. The filesystem backend is used by
+default, so the state is shared by all the worker processes of a deployment.
+
+In front of it, every worker process keeps the live instances of its most
+recent sessions in memory, so a tick served by the same worker only has to
+check the session's timestep in the store instead of unpickling the instance.
+Saving still writes the pickled instance through to the store on every tick.
+Since the requests of a session share its live instance, a request advancing it
+holds the session's lock from `load_session` through `save_session`.
+
+Components:
+- `cache`: The Flask-Caching instance holding the simulation states.
+- `init_app`: Binds the store to a Flask server.
+- `session_lock`: Serializes the requests that advance a session.
+- `create_session`, `load_session`, `save_session`, `delete_session`: Manage the
+  simulation state of a session.
+"""
+
+# --- Imports ---
+# Standard library imports
+import os
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Optional
+from uuid import uuid4
+
+# Third-party library imports
+from flask import Flask
+from flask_caching import Cache
+
+# Local application imports
+from src.sim import EconomicNetwork
+
+# --- Configuration ---
+# Simulations left untouched for longer than SESSION_TIMEOUT seconds are dropped.
+SESSION_TIMEOUT = 3600
+
+# Number of concurrent sessions kept before the oldest entries are pruned
+MAX_SESSIONS = 1000
+
+# The store is shared through a directory resolved independently of the working
+# directory of each worker, and can be moved with the SESSION_CACHE_DIR variable.
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CACHE_DIR = os.environ.get('SESSION_CACHE_DIR', os.path.join(_PROJECT_ROOT, '.cache'))
+
+CACHE_CONFIG = {
+    'CACHE_TYPE': 'FileSystemCache',
+    'CACHE_DIR': CACHE_DIR,
+    'CACHE_DEFAULT_TIMEOUT': SESSION_TIMEOUT,
+    # The threshold counts keys, and every session is stored under two keys
+    'CACHE_THRESHOLD': 2 * MAX_SESSIONS,
+}
+
+# Number of live instances kept in memory by each worker process
+MAX_LOCAL_SESSIONS = 256
+
+cache = Cache()
+
+# Least recently used sessions first
+_local: "OrderedDict[str, EconomicNetwork]" = OrderedDict()
+_lock = threading.Lock()
+
+# Lock of every session in use, dropped once no request holds a reference to it
+_session_locks: "weakref.WeakValueDictionary[str, threading.Lock]" = weakref.WeakValueDictionary()
+
+
+def init_app(server: Flask) -> None:
+    """
+    Binds the session store to the Flask server of the application.
+
+    Parameters:
+        server (Flask): The Flask server of the Dash application.
+    """
+    cache.init_app(server, config=CACHE_CONFIG)
+
+
+def _key(sid: str) -> str:
+    """
+    Builds the cache key under which the state of a session is stored.
+
+    Parameters:
+        sid (str): The session id.
+
+    Returns:
+        str: The cache key.
+    """
+    return f"econ:{sid}"
+
+
+def _step_key(sid: str) -> str:
+    """
+    Builds the cache key under which the timestep of a session is stored.
+
+    Parameters:
+        sid (str): The session id.
+
+    Returns:
+        str: The cache key.
+    """
+    return f"econ-t:{sid}"
+
+
+def _remember(sid: str, econ: EconomicNetwork) -> None:
+    """
+    Keeps a live instance in the in-memory store, evicting the least recently used ones.
+
+    Parameters:
+        sid (str): The session id.
+        econ (EconomicNetwork): The simulation instance.
+    """
+    with _lock:
+        _local[sid] = econ
+        _local.move_to_end(sid)
+        while len(_local) > MAX_LOCAL_SESSIONS:
+            _local.popitem(last=False)
+
+
+def session_lock(sid: str) -> threading.Lock:
+    """
+    Returns the lock serializing the requests that advance a session in this worker.
+
+    The instance returned by `load_session` is shared by all the requests of the
+    session, so the lock must be held from loading the instance, through
+    advancing it, to saving it.
+
+    Parameters:
+        sid (str): The session id.
+
+    Returns:
+        threading.Lock: The lock of the session.
+    """
+    with _lock:
+        lock = _session_locks.get(sid)
+        if lock is None:
+            lock = _session_locks[sid] = threading.Lock()
+        return lock
+
+
+def create_session(econ: EconomicNetwork) -> str:
+    """
+    Stores the state of a new simulation under a fresh session id.
+
+    Parameters:
+        econ (EconomicNetwork): The simulation instance.
+
+    Returns:
+        str: The session id, to be kept by the browser.
+    """
+    sid = uuid4().hex
+    save_session(sid, econ)
+    return sid
+
+
+def load_session(sid: str) -> Optional[EconomicNetwork]:
+    """
+    Retrieves the state of a simulation.
+
+    Parameters:
+        sid (str): The session id.
+
+    Returns:
+        Optional[EconomicNetwork]: The simulation instance, or None if the session
+                                   is unknown or has expired.
+    """
+    t = cache.get(_step_key(sid))
+    if t is None:
+        with _lock:
+            _local.pop(sid, None)
+        return None
+
+    # The in-memory instance is only reused if no other worker has advanced it since
+    with _lock:
+        econ = _local.get(sid)
+        if econ is not None and econ.t == t:
+            _local.move_to_end(sid)
+            return econ
+
+    econ = cache.get(_key(sid))
+    if econ is not None:
+        _remember(sid, econ)
+    return econ
+
+
+def save_session(sid: str, econ: EconomicNetwork) -> None:
+    """
+    Stores the updated state of a simulation.
+
+    The store is written through: the instance is pickled and written on every
+    call, even when this worker's in-memory copy is current, so that any other
+    worker can pick the session up. This write remains the main serialization
+    cost of a tick, which is why the pickled state of `EconomicNetwork` is kept
+    to its history buffers.
+
+    Parameters:
+        sid (str): The session id.
+        econ (EconomicNetwork): The simulation instance.
+    """
+    # The timestep is written last, so it never refers to a newer state than the stored one
+    cache.set(_key(sid), econ)
+    cache.set(_step_key(sid), econ.t)
+    _remember(sid, econ)
+
+
+def delete_session(sid: str) -> None:
+    """
+    Drops the state of a simulation.
+
+    Parameters:
+        sid (str): The session id.
+    """
+    cache.delete_many(_step_key(sid), _key(sid))
+    with _lock:
+        _local.pop(sid, None)
@@ -11,15 +11,24 @@ allowing for its seamless integration with a Dash-based user interface.
 
 # --- Imports ---
 # Standard library imports
-import random
-from collections import deque
-from typing import Deque, List, Dict, Any, Optional
+from typing import List, Dict, Optional
 
 # Third-party library imports
 import numpy as np
 
 # Local application imports
-from src.anomaly_detection import detect_anomaly
+from src.anomaly_detection import StreamingDecomposer, detect_anomalies_batch, seasonal_period
+from src.sim_kernels import advance_state, clip_propensity, fill_matrix, simulate_path
+
+# --- Constants ---
+# Per-timestep state fields, in the row order used by the history buffer
+FIELDS = ("omegah", "omegaf", "savings_household", "savings_firm", "consumption", "wage")
+# Fields on which anomaly detection is performed
+OUTLIER_FIELDS = ("omegah", "omegaf")
+
+_ROW = {key: i for i, key in enumerate(FIELDS)}
+_OUTLIER_ROW = {key: i for i, key in enumerate(OUTLIER_FIELDS)}
+_OUTLIER_DATA_ROWS = [_ROW[key] for key in OUTLIER_FIELDS]
 
 
 class EconomicNetwork:
@@ -30,12 +39,17 @@ class EconomicNetwork:
     outliers in key economic indicators. It uses a simple model to update
     consumption, wage, and savings based on propensity and discount factors.
 
+    The history is stored as a struct of arrays: one contiguous NumPy row per
+    state field, preallocated with twice the memory window. New timesteps are
+    written at the end of the live window, which is shifted back to the start
+    of the buffer only once the buffer is exhausted, so every step is amortized
+    O(1) and the history of any field is always available as a contiguous view.
+
     Attributes:
         volatility_input (float): Volatility sensitivity, controlling the magnitude of random
                       fluctuations in omegah and omegaf.
         memory_input (int): The size of the historical memory window used for anomaly detection.
-        history (Deque[Dict[str, Any]]): A double-ended queue storing the state of the
-                                         simulation at each timestep, limited by `memory_input`.
+        detection_stride (int): The number of timesteps between two anomaly detections.
         t (int): The current timestep of the simulation.
     """
 
@@ -47,6 +61,9 @@ class EconomicNetwork:
         savings: List[float],
         consumption_init: float = 0.0,
         wage_init: float = 0.0,
+        streaming_anomalies: bool = False,
+        seed: Optional[int] = None,
+        detection_stride: int = 1,
     ):
         """
         Initializes a new EconomicNetwork simulation instance.
@@ -62,39 +79,106 @@ class EconomicNetwork:
             savings (List[float]): A list containing two float values: [household_savings, firm_savings].
             consumption_init (float): The initial consumption value.
             wage_init (float): The initial wage value.
+            streaming_anomalies (bool): If True, anomalies are detected with an incremental
+                                        `StreamingDecomposer` per propensity, costing O(period)
+                                        per step, instead of decomposing the whole window.
+            seed (Optional[int]): An optional seed for the random number generator, for
+                                  reproducible simulations.
+            detection_stride (int): Anomaly detection is only performed on every
+                                    `detection_stride`-th timestep; the timesteps in
+                                    between are not flagged. Defaults to every timestep.
+
+        Raises:
+            ValueError: If `detection_stride` is not a positive integer.
         """
+        if (
+            isinstance(detection_stride, bool)
+            or not isinstance(detection_stride, (int, np.integer))
+            or detection_stride < 1
+        ):
+            raise ValueError(f"detection_stride must be a positive integer, got {detection_stride!r}")
 
         # --- Instance Attribute Initialization ---
         self.volatility_input = volatility_input
         self.memory_input = memory_input
+        self.detection_stride = detection_stride
         self.t = 0
 
+        # --- Random Fluctuations ---
+        # Fluctuations are drawn from a PCG64 generator, two per timestep
+        self._rng = np.random.default_rng(seed)
+
+        # --- History Buffers ---
+        # The live window of the history spans the columns [_start, _end)
+        capacity = 2 * memory_input
+        self._data = np.empty((len(FIELDS), capacity), dtype=np.float64)
+        self._outliers = np.zeros((len(OUTLIER_FIELDS), capacity), dtype=np.bool_)
+        self._start = 0
+        self._end = 1
+
+        # Normalized economic matrix, refreshed by `get_matrix` once per timestep
+        self._matrix = np.zeros((2, 2), dtype=np.float64)
+        self._matrix_t = -1
+
         # Define the initial state of the simulation
-        initial_state = {
-            "omegah": propensities[0],
-            "omegaf": propensities[1],
-            "outliers": {"omegah": [False], "omegaf": [False]},
-            "savings_household": savings[0],
-            "savings_firm": savings[1],
-            "consumption": consumption_init,
-            "wage": wage_init,
-        }
+        self._data[:, 0] = (
+            propensities[0],
+            propensities[1],
+            savings[0],
+            savings[1],
+            consumption_init,
+            wage_init,
+        )
+
+        # --- Streaming Anomaly Detection ---
+        # Each decomposer sees every value, and keeps as many residuals as the detection window
+        self._decomposers: Optional[Dict[str, StreamingDecomposer]] = None
+        if streaming_anomalies:
+            window = memory_input + 1
+            self._decomposers = {
+                key: StreamingDecomposer(seasonal_period(window), window) for key in OUTLIER_FIELDS
+            }
+            for key, decomposer in self._decomposers.items():
+                decomposer.push(propensities[_OUTLIER_ROW[key]])
 
-        # Initialize the history deque with the initial state
-        self.history: Deque[Dict[str, Any]] = deque([initial_state], maxlen=memory_input)
+    def __len__(self) -> int:
+        """
+        Returns the number of timesteps currently held in the history window.
+        """
+        return self._end - self._start
 
-    def get_values(self, key: str) -> List[float]:
+    def get_values(self, key: str) -> np.ndarray:
         """
-        Retrieves a list of recent values for a specified key from the simulation history.
+        Retrieves the recent values for a specified key from the simulation history.
 
         Parameters:
             key (str): The state key (e.g., 'omegah', 'omegaf', 'consumption') for which
                        to retrieve historical data.
 
         Returns:
-            List[float]: A list of float values from the history for the given key.
+            np.ndarray: A read-only view over the history of the given key, oldest first.
+                        The view is overwritten once the simulation advances, so
+                        values kept across steps must be copied.
         """
-        return [state[key] for state in self.history]
+        view = self._data[_ROW[key], self._start:self._end]
+        view.flags.writeable = False
+        return view
+
+    def get_outliers(self, key: str) -> np.ndarray:
+        """
+        Retrieves the outlier flags for a specified key from the simulation history.
+
+        Parameters:
+            key (str): The propensity key ('omegah' or 'omegaf').
+
+        Returns:
+            np.ndarray: A read-only boolean view aligned with `get_values(key)`.
+                        The view is overwritten once the simulation advances, so
+                        flags kept across steps must be copied.
+        """
+        view = self._outliers[_OUTLIER_ROW[key], self._start:self._end]
+        view.flags.writeable = False
+        return view
 
     def step(self, omegah_override: Optional[float] = None, omegaf_override: Optional[float] = None) -> None:
         """
@@ -106,70 +190,123 @@ class EconomicNetwork:
 
         Parameters:
             omegah_override (Optional[float]): An optional float value to manually set the
-                                               new omegah for this timestep. Must be in [0, 1].
+                                               new omegah for this timestep. It is clamped
+                                               to [0.01, 0.99], like every propensity.
             omegaf_override (Optional[float]): An optional float value to manually set the
-                                             new omegaf for this timestep. Must be in [0, 1].
+                                             new omegaf for this timestep. It is clamped
+                                             to [0.01, 0.99], like every propensity.
         """
-        prev = self.history[-1]
+        last = self._end - 1
+        d_omegah, d_omegaf = self._rng.uniform(-self.volatility_input, self.volatility_input, size=2)
 
-        # Update omegah and omegaf with random volatility, or use an override value
+        # Update omegah and omegaf with random volatility, or use an override value.
+        # Overrides are clamped too, so the flows of the model stay finite.
         omegah = (
-            omegah_override
+            clip_propensity(omegah_override, 0.0)
             if omegah_override is not None
-            else max(0.01, min(0.99, prev["omegah"] + random.uniform(-self.volatility_input, self.volatility_input)))
+            else clip_propensity(self._data[_ROW["omegah"], last], d_omegah)
         )
         omegaf = (
-            omegaf_override
+            clip_propensity(omegaf_override, 0.0)
             if omegaf_override is not None
-            else max(0.01, min(0.99, prev["omegaf"] + random.uniform(-self.volatility_input, self.volatility_input)))
+            else clip_propensity(self._data[_ROW["omegaf"], last], d_omegaf)
         )
 
+        self._advance(omegah, omegaf)
+
+    def step_many(self, n: int) -> None:
+        """
+        Advances the simulation by `n` timesteps without overrides.
+
+        The random fluctuations are drawn in a single vectorized call, which
+        consumes the generator exactly like as many `step` calls, so for a
+        given seed any mix of `step` and `step_many` calls follows the same
+        trajectory as as many `step` calls. The economic model is iterated over
+        as many timesteps as fit in the history buffer at once by the compiled
+        `simulate_path` kernel. The new timesteps are then recorded one by one,
+        with anomaly detection applying `detection_stride` exactly as in `step`.
+
+        Parameters:
+            n (int): The number of timesteps to simulate.
+        """
+        jitters = self._rng.uniform(-self.volatility_input, self.volatility_input, size=(n, 2))
+        done = 0
+        while done < n:
+            self._make_room()
+            count = min(n - done, self._data.shape[1] - self._end)
+            simulate_path(self._data, self._end, jitters[done:done + count])
+            for _ in range(count):
+                self._record()
+            done += count
+
+    def _advance(self, omegah: float, omegaf: float) -> None:
+        """
+        Computes and records the next timestep given its propensities.
+
+        Parameters:
+            omegah (float): The household's propensity to consume for the new timestep.
+            omegaf (float): The firm's propensity to pay wages for the new timestep.
+        """
+        self._make_room()
+
         # --- Economic Model Calculations ---
+        last = self._end - 1
+        consumption, wage, savings_household, savings_firm = advance_state(
+            omegah,
+            omegaf,
+            self._data[_ROW["savings_household"], last],
+            self._data[_ROW["savings_firm"], last],
+        )
 
-        factor = (1/omegah * 1/omegaf - 1) ** -1
+        # --- State Update ---
+        self._data[:, self._end] = (omegah, omegaf, savings_household, savings_firm, consumption, wage)
+        self._record()
 
-        # Calculate consumption based on wage, household savings, and the household factor
-        consumption = factor * (1/omegaf * prev["savings_household"] + prev["savings_firm"])
+    def _make_room(self) -> None:
+        """
+        Makes room at the end of the buffer by moving the live window to its start,
+        once the buffer is exhausted.
+        """
+        if self._end == self._data.shape[1]:
+            keep = self._end - self._start
+            self._data[:, :keep] = self._data[:, self._start:self._end]
+            self._outliers[:, :keep] = self._outliers[:, self._start:self._end]
+            self._start, self._end = 0, keep
 
-        # Calculate wage based on savings and the derived factors
-        wage = factor * (prev["savings_household"] + 1/omegah * prev["savings_firm"])
+    def _record(self) -> None:
+        """
+        Records the timestep written at the end of the live window.
 
-        # Update savings based on consumption and wage
-        savings_household = (1/omegah - 1) * consumption
-        savings_firm = (1/omegaf - 1) * wage
+        Anomaly detection is performed on its propensities, and the live window
+        is extended to include it.
+        """
+        new = self._end
 
         # --- Anomaly Detection ---
-        # Only run anomaly detection if the history is at its maximum length
-        if len(self.history) == self.memory_input:
-            omegah_vals = self.get_values("omegah") + [omegah]
-            omegaf_vals = self.get_values("omegaf") + [omegaf]
-            omegah_out = detect_anomaly(omegah_vals)
-            omegaf_out = detect_anomaly(omegaf_vals)
-            outliers = {
-                "omegah": (prev["outliers"]["omegah"] + [omegah_out])[-self.memory_input:],
-                "omegaf": (prev["outliers"]["omegaf"] + [omegaf_out])[-self.memory_input:],
-            }
+        if self._decomposers is not None:
+            for key, decomposer in self._decomposers.items():
+                decomposer.push(self._data[_ROW[key], new])
+
+        # Only run anomaly detection if the history is at its maximum length.
+        # The window spans the full history plus the new timestep.
+        if self._end - self._start == self.memory_input:
+            if (self.t + 1) % self.detection_stride:
+                # Timesteps between two detections are not flagged
+                self._outliers[:, new] = False
+            elif self._decomposers is not None:
+                for key, row in _OUTLIER_ROW.items():
+                    self._outliers[row, new] = self._decomposers[key].is_anomaly()
+            else:
+                # Both propensities are checked in a single batched decomposition
+                window = self._data[_OUTLIER_DATA_ROWS, self._start:new + 1]
+                self._outliers[:, new] = detect_anomalies_batch(window.T)
+            self._start += 1
         else:
-            # If history is not yet full, initialize outliers as False
-            outliers = {
-                "omegah": prev["outliers"]["omegah"] + [False],
-                "omegaf": prev["outliers"]["omegaf"] + [False],
-            }
+            # If history is not yet full, the new timestep is not flagged
+            self._outliers[:, new] = False
 
-        # --- State Update ---
+        self._end += 1
         self.t += 1
-        state = {
-            "omegah": omegah,
-            "omegaf": omegaf,
-            "outliers": outliers,
-            "savings_household": savings_household,
-            "savings_firm": savings_firm,
-            "consumption": consumption,
-            "wage": wage,
-        }
-
-        # Add the new state to the history
-        self.history.append(state)
 
     def get_matrix(self) -> np.ndarray:
         """
@@ -180,22 +317,34 @@ class EconomicNetwork:
             [[savings_household, consumption],
              [wage,              savings_firm]]
 
+        The matrix is only computed once per timestep, and reused by the
+        following calls until the simulation advances.
+
         Returns:
-            np.ndarray: A 2x2 NumPy array with normalized values. If the total
-                        value is zero, it returns a zero matrix.
-        """
-        now = self.history[-1]
-        total = (
-            now["consumption"] +
-            now["wage"] +
-            now["savings_household"] +
-            now["savings_firm"]
-        )
+            np.ndarray: A read-only 2x2 view with normalized values. If the total
+                        value is zero, it returns a zero matrix. The view is
+                        overwritten once the simulation advances.
+        """
+        matrix = self._matrix
+        if self._matrix_t != self.t:
+            fill_matrix(self._data, self._end - 1, matrix)
+            self._matrix_t = self.t
+
+        view = matrix.view()
+        view.flags.writeable = False
+        return view
 
-        if total == 0:
-            return np.zeros((2, 2))
 
-        return np.array([
-            [now["savings_household"] / total, now["consumption"] / total],
-            [now["wage"] / total, now["savings_firm"] / total],
-        ])
+def warmup() -> None:
+    """
+    Runs a short simulation to compile the Numba kernels and exercise anomaly detection.
+
+    Calling this once at application start-up moves the JIT compilation cost
+    (or the loading of the on-disk kernel cache) away from the first user
+    interaction. The parallel `simulate_many` driver is deliberately left out:
+    it is not used by the application, and launching a parallel region from a
+    background thread is not supported by every Numba threading layer.
+    """
+    econ = EconomicNetwork(0.05, 3, [0.5, 0.5], [1.0, 1.0])
+    econ.step_many(5)
+    econ.get_matrix()
@@ -0,0 +1,207 @@
+"""
+Numerical Kernels Module for Interactive Economic Simulator.
+
+This module contains the scalar arithmetic at the core of the `EconomicNetwork`
+simulation, compiled to native code with Numba. Keeping the kernels as free
+functions operating on plain floats lets them be JIT-compiled in nopython mode
+and shared by every simulation driver. If Numba is not installed, the same
+kernels run as plain Python functions.
+
+Random fluctuations of single steps are drawn outside of the kernels, so the
+compiled code never needs to access the interpreter's random number generator
+state. The batch driver `simulate_path` receives them pre-drawn as an array,
+while `simulate_many` draws them with Numba's own per-thread generator, so
+independent trajectories can run in parallel without holding the GIL.
+"""
+
+# --- Imports ---
+# Third-party library imports
+import numpy as np
+
+try:
+    from numba import njit, prange
+except ImportError:
+    # Without Numba, the kernels run as plain Python functions
+    def njit(**options):
+        """
+        Returns the decorated kernel unchanged, ignoring the Numba compilation options.
+        """
+        return lambda func: func
+
+    prange = range
+
+
+# --- Kernels ---
+@njit(cache=True, boundscheck=False)
+def clip_propensity(value: float, jitter: float) -> float:
+    """
+    Applies a random fluctuation to a propensity, keeping it within [0.01, 0.99].
+
+    Parameters:
+        value (float): The current propensity value.
+        jitter (float): The random fluctuation to add.
+
+    Returns:
+        float: The perturbed propensity, clamped to the valid range.
+    """
+    return min(0.99, max(0.01, value + jitter))
+
+
+@njit(cache=True, fastmath=True, boundscheck=False)
+def advance_state(
+    omegah: float,
+    omegaf: float,
+    savings_household: float,
+    savings_firm: float,
+):
+    """
+    Computes the flows and savings of the next timestep.
+
+    Parameters:
+        omegah (float): The household's propensity to consume for the new timestep.
+        omegaf (float): The firm's propensity to pay wages for the new timestep.
+        savings_household (float): The household savings of the previous timestep.
+        savings_firm (float): The firm savings of the previous timestep.
+
+    Returns:
+        Tuple[float, float, float, float]: The new consumption, wage,
+                                           household savings and firm savings.
+    """
+    # (1/omegah * 1/omegaf - 1)**-1 == omegah*omegaf / (1 - omegah*omegaf), so both
+    # flows share a single reciprocal of the common denominator
+    inv = 1.0 / (1.0 - omegah * omegaf)
+
+    household_income = (savings_household + omegaf * savings_firm) * inv
+    firm_income = (omegah * savings_household + savings_firm) * inv
+
+    # Calculate consumption and wage based on household and firm savings
+    consumption = omegah * household_income
+    wage = omegaf * firm_income
+
+    # Update savings: (1/omega - 1) * omega * income == (1 - omega) * income
+    return (
+        consumption,
+        wage,
+        (1.0 - omegah) * household_income,
+        (1.0 - omegaf) * firm_income,
+    )
+
+
+@njit(cache=True, fastmath=True, boundscheck=False)
+def fill_matrix(data: np.ndarray, col: int, out: np.ndarray) -> None:
+    """
+    Writes the normalized economic matrix of one timestep into a preallocated array.
+
+    Parameters:
+        data (np.ndarray): The history buffer, one row per state field in the
+                           order omegah, omegaf, household savings, firm savings,
+                           consumption and wage.
+        col (int): The column of the timestep in the history buffer.
+        out (np.ndarray): The 2x2 output array, laid out as
+                          [[savings_household, consumption], [wage, savings_firm]].
+                          It is filled with zeros if the total value is zero.
+    """
+    savings_household = data[2, col]
+    savings_firm = data[3, col]
+    consumption = data[4, col]
+    wage = data[5, col]
+
+    total = consumption + wage + savings_household + savings_firm
+
+    if total == 0:
+        out[:, :] = 0.0
+        return
+
+    inv = 1.0 / total
+    out[0, 0] = savings_household * inv
+    out[0, 1] = consumption * inv
+    out[1, 0] = wage * inv
+    out[1, 1] = savings_firm * inv
+
+
+# --- Batch Drivers ---
+@njit(cache=True, fastmath=True, boundscheck=False)
+def simulate_path(data: np.ndarray, col: int, jitters: np.ndarray) -> None:
+    """
+    Simulates consecutive timesteps of a single trajectory into its history buffer.
+
+    The timesteps are advanced from the state held in column `col - 1`, and
+    written in place to the columns starting at `col`, so the whole batch runs
+    in one compiled loop instead of one interpreter round-trip per timestep.
+
+    Parameters:
+        data (np.ndarray): The history buffer, one row per state field in the
+                           order omegah, omegaf, household savings, firm savings,
+                           consumption and wage.
+        col (int): The column of the first simulated timestep. The buffer must
+                   have room for `len(jitters)` columns from there.
+        jitters (np.ndarray): An array of shape (n, 2) holding the random
+                              fluctuations of omegah and omegaf for every timestep.
+    """
+    omegah = data[0, col - 1]
+    omegaf = data[1, col - 1]
+    savings_household = data[2, col - 1]
+    savings_firm = data[3, col - 1]
+    for i in range(jitters.shape[0]):
+        omegah = clip_propensity(omegah, jitters[i, 0])
+        omegaf = clip_propensity(omegaf, jitters[i, 1])
+        consumption, wage, savings_household, savings_firm = advance_state(
+            omegah, omegaf, savings_household, savings_firm
+        )
+        data[0, col + i] = omegah
+        data[1, col + i] = omegaf
+        data[2, col + i] = savings_household
+        data[3, col + i] = savings_firm
+        data[4, col + i] = consumption
+        data[5, col + i] = wage
+
+
+@njit(cache=True, parallel=True, fastmath=True, boundscheck=False)
+def simulate_many(
+    n_traj: int,
+    n_steps: int,
+    omegah_init: float,
+    omegaf_init: float,
+    savings_household_init: float,
+    savings_firm_init: float,
+    volatility: float,
+) -> np.ndarray:
+    """
+    Simulates many independent trajectories of the economic network in parallel.
+
+    Every trajectory starts from the same initial state and evolves with its own
+    random propensity fluctuations. Anomaly detection is not performed.
+
+    Parameters:
+        n_traj (int): The number of independent trajectories.
+        n_steps (int): The number of timesteps simulated per trajectory.
+        omegah_init (float): The initial household propensity to consume.
+        omegaf_init (float): The initial firm propensity to pay wages.
+        savings_household_init (float): The initial household savings.
+        savings_firm_init (float): The initial firm savings.
+        volatility (float): The volatility sensitivity of the propensities.
+
+    Returns:
+        np.ndarray: An array of shape (n_traj, n_steps, 6) holding, for every
+                    trajectory and timestep, the omegah, omegaf, household savings,
+                    firm savings, consumption and wage values.
+    """
+    out = np.empty((n_traj, n_steps, 6))
+    for i in prange(n_traj):
+        omegah = omegah_init
+        omegaf = omegaf_init
+        savings_household = savings_household_init
+        savings_firm = savings_firm_init
+        for t in range(n_steps):
+            omegah = clip_propensity(omegah, np.random.uniform(-volatility, volatility))
+            omegaf = clip_propensity(omegaf, np.random.uniform(-volatility, volatility))
+            consumption, wage, savings_household, savings_firm = advance_state(
+                omegah, omegaf, savings_household, savings_firm
+            )
+            out[i, t, 0] = omegah
+            out[i, t, 1] = omegaf
+            out[i, t, 2] = savings_household
+            out[i, t, 3] = savings_firm
+            out[i, t, 4] = consumption
+            out[i, t, 5] = wage
+    return out
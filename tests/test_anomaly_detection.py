@@ -0,0 +1,191 @@
+"""
+Tests for the seasonal decomposition and IQR checks of the `src.anomaly_detection` module.
+"""
+
+# --- Imports ---
+# Standard library imports
+import unittest
+
+# Third-party library imports
+import numpy as np
+
+# Local application imports
+from src.anomaly_detection import (
+    RunningQuartiles,
+    _decompose_residuals,
+    _quartiles,
+    detect_anomalies_batch,
+    detect_anomaly,
+)
+from src.sim import EconomicNetwork
+
+# --- Reference Vectors ---
+# Generated once with statsmodels 0.14.5, which the module no longer depends on:
+# the residuals of `seasonal_decompose(pd.Series(ts), model="additive",
+# period=period, extrapolate_trend="freq")`, and the IQR flag of their latest
+# value computed with `np.percentile`. Each case is (period, ts, residuals, flag),
+# and the periods are the ones `detect_anomaly` derives with `seasonality=0.3`.
+SEASONALITY = 0.3
+STATSMODELS_CASES = [
+    # 10 observations, period 3, no spike
+    (
+        3,
+        [0.507, 0.5306, 0.5378, 0.519, 0.482, 0.4377, 0.4692, 0.5201, 0.5439, 0.5074],
+        [-0.012665740740740821, -0.004239351851851786, 0.0034384259259259784,
+         0.021000925925926024, -0.007272685185185174, -0.030494907407407394,
+         0.008467592592592627, -0.000672685185185179, 0.014871759259259274,
+         -0.03304907407407402],
+        False,
+    ),
+    # 10 observations, period 3, with a spike planted at the end
+    (
+        3,
+        [0.507, 0.5306, 0.5378, 0.519, 0.482, 0.4377, 0.4692, 0.5201, 0.5439, 0.8074],
+        [-0.07377685185185193, 0.00964953703703711, 0.050660648148148205, -0.04011018518518509,
+         0.006616203703703722, 0.016727314814814834, -0.052643518518518485,
+         0.013216203703703716, -0.03790601851851848, 0.20583981481481492],
+        True,
+    ),
+    # 12 observations, period 4, no spike
+    (
+        4,
+        [0.5036, 0.5467, 0.5297, 0.5097, 0.4423, 0.4507, 0.5051, 0.5448, 0.5533, 0.5136,
+         0.4611, 0.4477],
+        [-0.0337187499999999, 0.007696250000000078, 0.023911249999999946, 0.027126250000000046,
+         -0.04186499999999998, -0.047997499999999964, 0.014473749999999959,
+         0.035988749999999875, 0.025460000000000045, -0.00982249999999995,
+         -0.08850874999999975, -0.11323874999999975],
+        False,
+    ),
+    # 12 observations, period 4, with a spike planted at the end
+    (
+        4,
+        [0.5036, 0.5467, 0.5297, 0.5097, 0.4423, 0.4507, 0.5051, 0.5448, 0.5533, 0.5136,
+         0.4611, 0.7477],
+        [-0.011843749999999896, 0.042071250000000074, 0.04578624999999995,
+         -0.05099874999999997, -0.019989999999999973, -0.013622499999999964,
+         0.036348749999999964, -0.04213625000000014, 0.04733500000000005,
+         -0.012947499999999928, -0.06663374999999974, 0.10863625000000028],
+        False,
+    ),
+    # 11 observations, period 4, no spike
+    (
+        4,
+        [0.4911, 0.5571, 0.534, 0.498, 0.4744, 0.4428, 0.4768, 0.5157, 0.5482, 0.5112, 0.4884],
+        [-0.05075135416666667, 0.025007395833333373, 0.021286979166666737,
+         -0.012161770833333346, -0.0014826041666666971, -0.03335510416666667,
+         -0.004600520833333325, 0.002700729166666655, 0.03804239583333333,
+         -0.005843854166666737, -0.030878020833333446],
+        False,
+    ),
+    # 11 observations, period 4, with a spike planted at the end
+    (
+        4,
+        [0.4911, 0.5571, 0.534, 0.498, 0.4744, 0.4428, 0.4768, 0.5157, 0.5482, 0.5112, 0.7884],
+        [-0.016376354166666676, 0.04688239583333337, -0.05683802083333325,
+         0.009713229166666656, 0.032892395833333296, -0.011480104166666668,
+         -0.08272552083333332, 0.024575729166666657, 0.03491739583333335, 0.016031145833333264,
+         0.19099697916666655],
+        True,
+    ),
+
+]
+
+
+class StatsmodelsReferenceTest(unittest.TestCase):
+    """
+    Pins the NumPy decomposition to the results of statsmodels, with odd and even
+    periods and windows whose length is not a multiple of the period.
+    """
+
+    def test_residuals_match_statsmodels(self):
+        for period, ts, residuals, _ in STATSMODELS_CASES:
+            with self.subTest(n=len(ts), period=period, last=ts[-1]):
+                np.testing.assert_allclose(
+                    _decompose_residuals(np.array(ts), period), residuals, rtol=1e-9, atol=1e-12
+                )
+
+    def test_flags_match_statsmodels(self):
+        for period, ts, _, flag in STATSMODELS_CASES:
+            with self.subTest(n=len(ts), period=period, last=ts[-1]):
+                self.assertEqual(detect_anomaly(ts, seasonality=SEASONALITY), flag)
+
+
+class QuartilesTest(unittest.TestCase):
+    """
+    Checks that the partition-based quartiles are identical to `np.quantile`.
+    """
+
+    def test_matches_np_quantile(self):
+        rng = np.random.default_rng(0)
+        for n in range(8, 12):  # Every length modulo 4
+            continuous = rng.normal(size=n)
+            ties = rng.integers(0, 3, size=n).astype(np.float64)
+            for name, values in (("continuous", continuous), ("ties", ties)):
+                with self.subTest(n=n, values=name):
+                    q1, q3 = _quartiles(values)
+                    expected = np.quantile(values, [0.25, 0.75])
+                    self.assertEqual(q1, expected[0])
+                    self.assertEqual(q3, expected[1])
+
+    def test_matches_np_quantile_per_column(self):
+        values = np.random.default_rng(1).integers(0, 4, size=(11, 3)).astype(np.float64)
+        q1, q3 = _quartiles(values)
+        expected = np.quantile(values, [0.25, 0.75], axis=0)
+        np.testing.assert_array_equal(q1, expected[0])
+        np.testing.assert_array_equal(q3, expected[1])
+
+
+class BatchDetectionTest(unittest.TestCase):
+    """
+    Checks that the batched detection flags the same series as `detect_anomaly`.
+    """
+
+    def test_matches_per_series_detection(self):
+        rng = np.random.default_rng(2)
+        flagged = 0
+        for n in (6, 11, 40, 101):
+            for trial in range(25):
+                # One row per propensity, as in the window of `EconomicNetwork`
+                window = 0.5 + np.cumsum(rng.uniform(-0.05, 0.05, size=(2, n)), axis=1)
+                window[trial % 2, -1] += rng.choice([0.0, 0.3])
+                with self.subTest(n=n, trial=trial):
+                    batch = detect_anomalies_batch(window.T)
+                    expected = [detect_anomaly(row) for row in window]
+                    self.assertEqual(batch.tolist(), expected)
+                    flagged += sum(expected)
+        self.assertGreater(flagged, 0)
+
+
+class StreamingDetectionTest(unittest.TestCase):
+    """
+    Tests the incremental quartiles and anomaly detection of the streaming path.
+    """
+
+    def test_running_quartiles_over_sliding_window(self):
+        rng = np.random.default_rng(3)
+        window = 7
+        quartiles = RunningQuartiles(window)
+        values = np.round(rng.normal(size=60), 1)  # Rounded, so the window has ties
+        for i, value in enumerate(values):
+            quartiles.push(value)
+            current = values[max(0, i + 1 - window):i + 1]
+            with self.subTest(i=i):
+                self.assertEqual(len(quartiles), len(current))
+                for q in (0.0, 0.25, 0.5, 0.75, 1.0):
+                    self.assertAlmostEqual(quartiles.quantile(q), np.quantile(current, q), places=12)
+
+    def test_streaming_anomalies_flag_a_planted_spike(self):
+        econ = EconomicNetwork(
+            0.01, 20, [0.5, 0.5], [100.0, 0.0], streaming_anomalies=True, seed=4
+        )
+        econ.step_many(60)
+        self.assertFalse(econ.get_outliers("omegah")[-1])
+
+        # Push omegah far away from its recent values
+        econ.step(omegah_override=0.95)
+        self.assertTrue(econ.get_outliers("omegah")[-1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+"""
+Tests for the figure builders and partial updates of the `src.callbacks` module.
+"""
+
+# --- Imports ---
+# Standard library imports
+import json
+import unittest
+
+# Local application imports
+from src.callbacks import build_propensity_figure, patch_propensity_figure
+from src.sim import EconomicNetwork
+
+
+def _apply(figure: dict, patch) -> None:
+    """
+    Applies the operations of a Dash `Patch` to a figure in place, like the browser does.
+    """
+    for operation in patch.to_plotly_json()["operations"]:
+        *path, last = operation["location"]
+        target = figure
+        for key in path:
+            target = target[key]
+        kind = operation["operation"]
+        if kind == "Assign":
+            target[last] = operation["params"]["value"]
+        elif kind == "Delete":
+            del target[last]
+        elif kind == "Append":
+            target[last].append(operation["params"]["value"])
+        elif kind == "Prepend":
+            target[last].insert(0, operation["params"]["value"])
+        else:
+            raise AssertionError(f"unexpected patch operation {kind}")
+
+
+class PatchPropensityFigureTest(unittest.TestCase):
+    """
+    Tests that patching the propensity figure step by step matches rebuilding it.
+    """
+
+    def test_patched_figure_matches_the_rebuilt_one(self):
+        for memory in (3, 5, 9):
+            with self.subTest(memory_input=memory):
+                econ = EconomicNetwork(0.3, memory, [0.5, 0.5], [100.0, 0.0], seed=memory)
+                # The browser holds its own copy of the figure, without lists shared between traces
+                figure = json.loads(json.dumps(build_propensity_figure(econ)))
+                # The history fills up over the first steps, then keeps a full window
+                for _ in range(40):
+                    length = len(econ)
+                    econ.step()
+                    _apply(figure, patch_propensity_figure(econ, grew=len(econ) > length))
+                    self.assertEqual(figure, build_propensity_figure(econ))
+                self.assertEqual(len(econ), memory)
+
+
+if __name__ == "__main__":
+    unittest.main()
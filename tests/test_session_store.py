@@ -0,0 +1,86 @@
+"""
+Tests for the two-level simulation store of the `src.session_store` module.
+"""
+
+# --- Imports ---
+# Standard library imports
+import copy
+import threading
+import unittest
+from unittest import mock
+
+# Third-party library imports
+from flask import Flask
+
+# Local application imports
+from src import session_store
+from src.sim import EconomicNetwork
+
+
+class SessionStoreTest(unittest.TestCase):
+    """
+    Tests that the in-memory instances are only reused while they match the shared store.
+    """
+
+    def setUp(self):
+        self.app = Flask(__name__)
+        with mock.patch.dict(session_store.CACHE_CONFIG, {"CACHE_TYPE": "SimpleCache"}):
+            session_store.init_app(self.app)
+        context = self.app.app_context()
+        context.push()
+        self.addCleanup(context.pop)
+        self.addCleanup(session_store._local.clear)
+
+        self.econ = EconomicNetwork(0.05, 5, [0.5, 0.5], [100.0, 0.0], seed=0)
+        self.econ.step()
+        self.sid = session_store.create_session(self.econ)
+
+    def test_reuses_the_in_memory_instance_at_the_stored_timestep(self):
+        self.assertIs(session_store.load_session(self.sid), self.econ)
+
+    def test_reloads_after_another_worker_saves_a_newer_timestep(self):
+        # Another worker advances its own copy and writes it to the shared store only
+        other = copy.deepcopy(self.econ)
+        other.step()
+        session_store.cache.set(session_store._key(self.sid), other)
+        session_store.cache.set(session_store._step_key(self.sid), other.t)
+
+        loaded = session_store.load_session(self.sid)
+        self.assertIsNot(loaded, self.econ)
+        self.assertEqual(loaded.t, other.t)
+        self.assertEqual(list(loaded.get_values("omegah")), list(other.get_values("omegah")))
+        self.assertIs(session_store.load_session(self.sid), loaded)
+
+    def test_returns_none_after_delete(self):
+        session_store.delete_session(self.sid)
+        self.assertIsNone(session_store.load_session(self.sid))
+        self.assertNotIn(self.sid, session_store._local)
+
+    def test_threads_advancing_one_session_take_turns(self):
+        errors = []
+
+        def tick():
+            try:
+                # Every request has its own application context
+                with self.app.app_context():
+                    for _ in range(200):
+                        with session_store.session_lock(self.sid):
+                            econ = session_store.load_session(self.sid)
+                            econ.step()
+                            session_store.save_session(self.sid, econ)
+            except Exception as exc:
+                errors.append(exc)
+
+        threads = [threading.Thread(target=tick) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(session_store.load_session(self.sid).t, 401)
+        self.assertEqual(len(self.econ), 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
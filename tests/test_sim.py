@@ -0,0 +1,67 @@
+"""
+Tests for the `EconomicNetwork` simulation of the `src.sim` module.
+"""
+
+# --- Imports ---
+# Standard library imports
+import unittest
+
+# Third-party library imports
+import numpy as np
+
+# Local application imports
+from src.sim import FIELDS, EconomicNetwork
+
+
+class DetectionStrideTest(unittest.TestCase):
+    """
+    Tests the validation and effect of the `detection_stride` argument.
+    """
+
+    def test_rejects_invalid_strides(self):
+        for stride in (0, -1, 1.5, "2", True, None):
+            with self.subTest(stride=stride):
+                with self.assertRaises(ValueError):
+                    EconomicNetwork(0.05, 5, [0.5, 0.5], [100.0, 0.0], detection_stride=stride)
+
+    def test_only_every_stride_th_timestep_is_checked(self):
+        for streaming in (False, True):
+            with self.subTest(streaming_anomalies=streaming):
+                econ = EconomicNetwork(
+                    0.3, 5, [0.5, 0.5], [100.0, 0.0],
+                    streaming_anomalies=streaming, seed=0, detection_stride=3,
+                )
+                flagged = []
+                for _ in range(200):
+                    econ.step()
+                    flagged.append(bool(econ.get_outliers("omegah")[-1] or econ.get_outliers("omegaf")[-1]))
+                self.assertTrue(any(flagged))
+                self.assertTrue(all(not f for t, f in enumerate(flagged, start=1) if t % 3))
+
+
+class RandomStreamTest(unittest.TestCase):
+    """
+    Tests that `step` and `step_many` share the random stream of a seeded simulation.
+    """
+
+    def test_mixed_steps_follow_the_trajectory_of_single_steps(self):
+        batches = [3, 1, 1029, 2, 40, 1]
+        reference = EconomicNetwork(0.05, 5, [0.5, 0.5], [100.0, 0.0], seed=5)
+        mixed = EconomicNetwork(0.05, 5, [0.5, 0.5], [100.0, 0.0], seed=5)
+        for i, n in enumerate(batches):
+            for _ in range(n):
+                reference.step()
+            if i % 2:
+                for _ in range(n):
+                    mixed.step()
+            else:
+                mixed.step_many(n)
+
+        self.assertEqual(mixed.t, reference.t)
+        for key in FIELDS:
+            with self.subTest(key=key):
+                np.testing.assert_allclose(mixed.get_values(key), reference.get_values(key), rtol=1e-12)
+
+
+if __name__ == "__main__":
+    unittest.main()